@@ -0,0 +1,13 @@
+"""Performance benchmarks for pyspanet.
+
+The benchmarks import the stand-in relay from ``testing`` and read the
+frames under ``tests/fixtures``, so they run from a checkout. Run them
+from the repository root::
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+
+or from elsewhere with the checkout on the path::
+
+    PYTHONPATH=/path/to/pyspanet python -m benchmarks run
+"""
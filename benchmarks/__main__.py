@@ -0,0 +1,89 @@
+"""Main entry."""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import List, Optional
+
+from .compare import DEFAULT_THRESHOLD, compare, load, report
+from .suite import BENCHMARKS, as_dict, run_benchmarks
+
+DEFAULT_OUTPUT = 'benchmark-results.json'
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the benchmarks and write a results file."""
+    results = run_benchmarks(args.benchmark, args.size, args.duration)
+
+    for result in results:
+        print(f'{result.name:<24}{result.rate:>14,.0f} {result.unit:<12}'
+              f'{result.peak_memory / 1024:>10,.1f} KiB')
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.time(),
+            'results': as_dict(results),
+        }, file, indent=2)
+
+    return 0
+
+
+def diff(args: argparse.Namespace) -> int:
+    """Compare two results files, failing on a regression."""
+    comparisons = compare(load(args.base), load(args.head), args.threshold)
+    print(report(comparisons))
+
+    return 1 if any(item.regressed for item in comparisons) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments and run a command."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument(
+        'benchmark', nargs='*',
+        help='benchmarks to run, all by default: ' + ', '.join(
+            benchmark.name for benchmark in BENCHMARKS
+        )
+    )
+    run_parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    run_parser.add_argument(
+        '-n', '--size', type=int, default=64,
+        help='number of frames in the corpus'
+    )
+    run_parser.add_argument(
+        '-d', '--duration', type=float, default=1.0,
+        help='seconds to spend timing each benchmark'
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        'compare', help='compare two results files'
+    )
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='relative change counted as a regression'
+    )
+    compare_parser.set_defaults(func=diff)
+
+    args = parser.parse_args(argv)
+    names = {benchmark.name for benchmark in BENCHMARKS}
+
+    for name in getattr(args, 'benchmark', []):
+        if name not in names:
+            parser.error(f'unknown benchmark: {name}')
+
+    return int(args.func(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
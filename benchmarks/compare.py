@@ -0,0 +1,84 @@
+""" benchmarks.compare """
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+DEFAULT_THRESHOLD = 0.1
+
+Results = Dict[str, Dict[str, Any]]
+
+
+class Comparison(NamedTuple):
+    """ Comparison
+
+    ``rate`` and ``memory`` are the relative changes, e.g. -0.2 for a
+    benchmark that runs 20% slower.
+    """
+    name: str
+    unit: str
+    rate: Optional[float]
+    memory: Optional[float]
+    regressed: bool
+
+
+def load(path: str) -> Results:
+    """Load the results of a benchmark run."""
+    with open(path, encoding='utf-8') as file:
+        results: Results = json.load(file)['results']
+
+    return results
+
+
+def _change(old: float, new: float) -> Optional[float]:
+    return None if not old else (new - old) / old
+
+
+def compare(
+    base: Results,
+    head: Results,
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Comparison]:
+    """Compare the benchmarks present in both runs.
+
+    A benchmark regressed when its rate dropped, or its peak memory grew,
+    by more than threshold.
+    """
+    comparisons: List[Comparison] = []
+
+    for name, new in head.items():
+        old = base.get(name)
+
+        if old is None:
+            continue
+
+        rate = _change(old['rate'], new['rate'])
+        memory = _change(old['peak_memory'], new['peak_memory'])
+
+        comparisons.append(Comparison(
+            name,
+            new['unit'],
+            rate,
+            memory,
+            (rate is not None and rate < -threshold) or
+            (memory is not None and memory > threshold)
+        ))
+
+    return comparisons
+
+
+def report(comparisons: List[Comparison]) -> str:
+    """Format comparisons as a table."""
+    def percent(change: Optional[float]) -> str:
+        return '-' if change is None else f'{change:+.1%}'
+
+    lines = [f"{'benchmark':<24}{'rate':>10}{'memory':>10}"]
+
+    for item in comparisons:
+        flag = '  REGRESSED' if item.regressed else ''
+        lines.append(
+            f'{item.name:<24}{percent(item.rate):>10}'
+            f'{percent(item.memory):>10}{flag}'
+        )
+
+    return '\n'.join(lines)
@@ -0,0 +1,48 @@
+""" benchmarks.corpus """
+from __future__ import annotations
+
+import glob
+import os
+from typing import List
+
+from testing.spa_server import FIXTURES, load_frame, patch_frame
+
+# (record, index, values) swept to vary the frames like a live spa would
+_SWEEPS = (
+    ('R5', 14, [str(value) for value in range(240, 400, 8)]),
+    ('R5', 17, ['0', '1', '4']),
+    ('R6', 2, ['0', '3', '29']),
+    ('R2', 3, [str(value) for value in range(0, 60, 7)]),
+)
+
+
+def fixtures() -> List[bytes]:
+    """Return every RF frame in the test fixtures."""
+    return [
+        load_frame(os.path.relpath(path, FIXTURES)[:-len('.txt')])
+        for path in sorted(glob.glob(os.path.join(FIXTURES, '**', '*.txt'),
+                                     recursive=True))
+    ]
+
+
+def corpus(size: int = 64) -> List[bytes]:
+    """Return size frames derived from the fixtures.
+
+    Consecutive frames differ in a few values, as successive refreshes of
+    a running spa do.
+    """
+    frames: List[bytes] = []
+    sources = fixtures()
+
+    while len(frames) < size:
+        for frame in sources:
+            step = len(frames)
+
+            for record, index, values in _SWEEPS:
+                frame = patch_frame(
+                    frame, record, index, values[step % len(values)]
+                )
+
+            frames.append(frame)
+
+    return frames[:size]
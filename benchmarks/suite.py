@@ -0,0 +1,263 @@
+""" benchmarks.suite """
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from pyspanet.collections import FloatCodedInteger, TimeCodedInteger
+from pyspanet.data import SpaData
+from pyspanet.enums import LightColour
+from pyspanet.net import SpaNetClient
+from pyspanet.parser import RFParser
+from testing.spa_server import SpaServer
+
+from .corpus import corpus
+
+CHUNK_SIZE = 1024
+
+
+class Result(NamedTuple):
+    """ Result """
+    name: str
+    unit: str
+    rate: float
+    peak_memory: int
+
+
+class Case(NamedTuple):
+    """ Case
+
+    ``run`` performs ``ops`` operations per call.
+    """
+    run: Callable[[], Any]
+    ops: int
+    close: Optional[Callable[[], None]] = None
+
+
+class Benchmark(NamedTuple):
+    """ Benchmark """
+    name: str
+    unit: str
+    setup: Callable[[List[bytes]], Case]
+
+
+def measure(
+    func: Callable[[], Any],
+    ops: int,
+    duration: float = 1.0,
+    repeat: int = 3
+) -> float:
+    """Return the best rate of func in operations per second."""
+    func()  # warm caches and interning
+
+    start = time.perf_counter()
+    func()
+    calls = max(1, int(duration / repeat / (time.perf_counter() - start)))
+    best = 0.0
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+
+        for _ in range(calls):
+            func()
+
+        best = max(best, calls * ops / (time.perf_counter() - start))
+
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak bytes allocated by one call of func."""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+###############################################################################
+# Parsing
+###############################################################################
+
+def parse(frames: List[bytes]) -> Case:
+    """Decode every frame into a new snapshot."""
+    def run() -> List[SpaData]:
+        return [SpaData(frame) for frame in frames]
+
+    return Case(run, len(frames))
+
+
+def parse_lazy(frames: List[bytes]) -> Case:
+    """Split every frame and decode a single section on access."""
+    def run() -> List[Any]:
+        return [SpaData(frame, lazy=True).temperature for frame in frames]
+
+    return Case(run, len(frames))
+
+
+def parse_chunks(frames: List[bytes]) -> Case:
+    """Feed every frame to an RFParser as the socket would deliver it."""
+    chunked = [
+        [frame[i:i + CHUNK_SIZE] for i in range(0, len(frame), CHUNK_SIZE)]
+        for frame in frames
+    ]
+
+    def run() -> List[SpaData]:
+        result = []
+
+        for chunks in chunked:
+            parser = RFParser()
+
+            for chunk in chunks:
+                parser.feed(chunk)
+
+            result.append(parser.result())
+
+        return result
+
+    return Case(run, len(frames))
+
+
+def apply(frames: List[bytes]) -> Case:
+    """Update one snapshot in place from successive frames."""
+    data = SpaData(frames[0])
+
+    def run() -> None:
+        for frame in frames:
+            data.apply(frame)
+
+    return Case(run, len(frames))
+
+
+###############################################################################
+# Access
+###############################################################################
+
+def access(frames: List[bytes]) -> Case:
+    """Read nested fields of a decoded snapshot."""
+    data = SpaData(frames[0])
+
+    def run() -> None:
+        for _ in range(100):
+            _ = data.settings.sleep.timer1.start
+            _ = data.pumps.pump1.state
+            _ = data.temperature.water
+            _ = data.lights.colour
+
+    return Case(run, 400)
+
+
+###############################################################################
+# Coded integers
+###############################################################################
+
+def float_coded_integer(_: List[bytes]) -> Case:
+    """Construct FloatCodedIntegers from frame bytes, strings and floats."""
+    values: List[Any] = [str(value).encode() for value in range(0, 600, 7)]
+    values += ['28.6', 37.5, '40.0', 1000]
+
+    def run() -> None:
+        for value in values:
+            FloatCodedInteger(value)
+
+    return Case(run, len(values))
+
+
+def time_coded_integer(_: List[bytes]) -> Case:
+    """Construct TimeCodedIntegers from frame bytes and time strings."""
+    values: List[Any] = [str(value).encode() for value in range(0, 5947, 61)]
+    values += ['7:45', '22:00', 9999]
+
+    def run() -> None:
+        for value in values:
+            TimeCodedInteger(value)
+
+    return Case(run, len(values))
+
+
+###############################################################################
+# Client
+###############################################################################
+
+def client(_: List[bytes]) -> Case:
+    """Send refresh and light commands to a local stand-in relay."""
+    loop = asyncio.new_event_loop()
+    server = SpaServer()
+    loop.run_until_complete(server.start())
+    spa = SpaNetClient(server.config())
+    loop.run_until_complete(spa.connect())
+
+    async def commands() -> None:
+        for _ in range(10):
+            await spa.refresh()
+            await spa.lights_control(LightColour.COLOUR_3)
+
+    def run() -> None:
+        loop.run_until_complete(commands())
+
+    def close() -> None:
+        loop.run_until_complete(spa.disconnect())
+        loop.run_until_complete(server.stop())
+        loop.close()
+
+    return Case(run, 20, close)
+
+
+BENCHMARKS = (
+    Benchmark('parse', 'frames/s', parse),
+    Benchmark('parse_lazy', 'frames/s', parse_lazy),
+    Benchmark('parse_chunks', 'frames/s', parse_chunks),
+    Benchmark('apply', 'frames/s', apply),
+    Benchmark('access', 'reads/s', access),
+    Benchmark('float_coded_integer', 'values/s', float_coded_integer),
+    Benchmark('time_coded_integer', 'values/s', time_coded_integer),
+    Benchmark('client', 'commands/s', client),
+)
+
+
+def run_benchmarks(
+    names: List[str],
+    size: int = 64,
+    duration: float = 1.0
+) -> List[Result]:
+    """Run the named benchmarks, or all of them, over a corpus."""
+    frames = corpus(size)
+    results: List[Result] = []
+
+    for benchmark in BENCHMARKS:
+        if names and benchmark.name not in names:
+            continue
+
+        case = benchmark.setup(frames)
+
+        try:
+            results.append(Result(
+                benchmark.name,
+                benchmark.unit,
+                measure(case.run, case.ops, duration),
+                peak_memory(case.run)
+            ))
+        finally:
+            if case.close is not None:
+                case.close()
+
+    return results
+
+
+def as_dict(results: List[Result]) -> Dict[str, Dict[str, Any]]:
+    """Return results keyed by benchmark name, as stored in JSON."""
+    return {
+        result.name: {
+            'unit': result.unit,
+            'rate': result.rate,
+            'peak_memory': result.peak_memory,
+        }
+        for result in results
+    }
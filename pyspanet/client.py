@@ -1,12 +1,16 @@
 """ SpaClient class """
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from builtins import type
-from typing import Any, Union
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
-from .collections import FloatCodedInteger, MyDict, PumpDict, TimeCodedInteger
-from .connection import SpaConnection
+from .collections import FloatCodedInteger, TimeCodedInteger
+from .config import SpaConfig
+from .connection import SpaCommand, SpaConnection, deadline_from
 from .const import (
     CMD_BLOWER,
     CMD_BLOWER_SPEED,
@@ -34,9 +38,11 @@ from .const import (
     CMD_TIME_OUT,
 )
 from .data import SpaData
+from .diff import SpaChange
 from .enums import (
     BlowerSpeed,
     BlowerState,
+    BreakerState,
     FiltrationCycle,
     FiltrationRuntime,
     HeatPumpMode,
@@ -51,55 +57,209 @@ from .enums import (
     OffOnAutoState,
     OffOnState,
     OperationMode,
+    OverflowPolicy,
 )
-from .exceptions import SpaConnectionError
+from .exceptions import SpaConnectionError, SpaTimeoutError
+from .parser import RFParser
+from .poller import SpaPoller, SpaPollerConfig
+from .profile import PUMPS, SpaProfile
+from .subscription import DEFAULT_MAXSIZE, SpaSubscription
+from .writebehind import SpaWriteBehind
+
+DEFAULT_MAX_AGE = 5.0
+
+# fields apply() can set, with their command and the type of value taken
+SETTINGS: Dict[str, Tuple[str, Type[Any]]] = {
+    'blower.speed': (CMD_BLOWER_SPEED, BlowerSpeed),
+    'blower.state': (CMD_BLOWER, BlowerState),
+    'lights.brightness': (CMD_LIGHTS_BRIGHTNESS, LightBrightness),
+    'lights.colour': (CMD_LIGHTS_COLOUR, LightColour),
+    'lights.effect': (CMD_LIGHTS_EFFECT, LightEffect),
+    'lights.mode': (CMD_LIGHTS_MODE, LightMode),
+    'lights.state': (CMD_LIGHTS_ON, OffOnState),
+    'settings.auto_clean': (CMD_CLEAN_AUTO, TimeCodedInteger),
+    'settings.filtration.cycle': (CMD_FILTRATION_CYCLE, FiltrationCycle),
+    'settings.filtration.runtime': (
+        CMD_FILTRATION_RUNTIME,
+        FiltrationRuntime
+    ),
+    'settings.heat_pump.boost': (CMD_HEAT_PUMP_BOOST, OffOnState),
+    'settings.heat_pump.mode': (CMD_HEAT_PUMP_MODE, HeatPumpMode),
+    'settings.lock_mode': (CMD_LOCK_MODE, LockMode),
+    'settings.time_out': (CMD_TIME_OUT, TimeCodedInteger),
+    'state.mode': (CMD_OPERATION_MODE, OperationMode),
+    'temperature.target': (CMD_TEMPERATURE, FloatCodedInteger),
+}
+
+PUMP_COMMANDS = dict(zip(
+    PUMPS,
+    (CMD_PUMP1, CMD_PUMP2, CMD_PUMP3, CMD_PUMP4, CMD_PUMP5)
+))
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class SpaClient():
-    """ SpaClient """
+    """ SpaClient
+
+    Every command accepts a ``timeout`` in seconds or an absolute
+    ``deadline`` (a ``time.monotonic()`` value). Without either the
+    connection's default for the command applies. A command that runs
+    out of time raises SpaTimeoutError.
+    """
     def __init__(self) -> None:
         """Initialize a spa client."""
+        self._config: SpaConfig
         self._connection: SpaConnection
         self._data: SpaData
+        self._refreshing: Optional[asyncio.Future[bool]] = None
+        self._refresh_count = 0
+        self._refresh_coalesced = 0
+        self._poller: Optional[SpaPoller] = None
+        self._listeners: List[Callable[[List[SpaChange]], None]] = []
+        self._subscriptions: List[SpaSubscription] = []
+        self._write_behind: Optional[SpaWriteBehind] = None
 
     @property
     def connected(self) -> bool:
         """ connected: bool """
         return bool(self._connection.connected)
 
+    @property
+    def breaker_state(self) -> BreakerState:
+        """Return the state of the reconnect circuit breaker."""
+        return self._connection.breaker_state
+
     @property
     def data(self) -> SpaData:
         """Return the data."""
         return self._data
 
-    async def connect(self) -> bool:
+    @property
+    def poller(self) -> Optional[SpaPoller]:
+        """Return the background poller, if polling."""
+        return self._poller
+
+    @property
+    def profile(self) -> SpaProfile:
+        """Return the capabilities of the spa, derived once per device."""
+        return self.data.profile
+
+    @property
+    def refresh_count(self) -> int:
+        """Return the number of refreshes sent to the spa."""
+        return self._refresh_count
+
+    @property
+    def refresh_coalesced(self) -> int:
+        """Return the number of refreshes that joined one in flight."""
+        return self._refresh_coalesced
+
+    async def connect(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """Connect to the spa."""
-        if not await self._connection.connect():
+        deadline = deadline_from(timeout, deadline)
+
+        self._connection.on_refresh(self._update)
+
+        if not await self._connection.connect(deadline=deadline):
             raise SpaConnectionError()
 
-        if not await self.refresh():
+        if not await self.refresh(deadline=deadline):
             raise SpaConnectionError()
 
         return True
 
     async def disconnect(self) -> None:
         """ disconnect: None """
+        if self._write_behind is not None:
+            await self._write_behind.flush()
+
+        await self.stop_polling()
         await self._connection.disconnect()
 
-    async def auto_clean(self, value: Union[int, str]) -> bool:
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    def add_listener(
+        self,
+        listener: Callable[[List[SpaChange]], None]
+    ) -> Callable[[], None]:
+        """Call listener with the changed fields after every refresh.
+
+        Returns a function that removes the listener again.
+        """
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    async def apply(
+        self,
+        changes: Dict[str, Any],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, bool]:
+        """Set several fields in one batch.
+
+        ``changes`` maps field paths to values, e.g.
+        ``{'lights.state': OffOnState.ON, 'temperature.target': 37.5}``.
+        Every change is validated before anything is sent, an invalid one
+        raises ValueError. The commands are pipelined in order and the
+        acknowledged values set on the data together.
+
+        Returns whether each path was acknowledged.
+        """
+        batch = [
+            (path, *self._command(path, value))
+            for path, value in changes.items()
+        ]
+
+        acks = await self._connection.send_many(
+            [command for _, command, _ in batch],
+            timeout=timeout,
+            deadline=deadline
+        )
+
+        for (path, _, value), ack in zip(batch, acks):
+            if ack:
+                self.data.set(path, value)
+
+        if any(acks) and self._poller is not None:
+            self._poller.kick()
+
+        return {path: ack for (path, _, _), ack in zip(batch, acks)}
+
+    async def auto_clean(
+        self,
+        value: Union[int, str],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ time_out: bool """
         return await self._set_time_coded_integer(
             CMD_CLEAN_AUTO,
-            self.data.settings,
-            'auto_clean',
-            value
+            'settings.auto_clean',
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
     async def blower_control(
         self,
-        value: Union[BlowerSpeed, BlowerState]
+        value: Union[BlowerSpeed, BlowerState],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ blower_control: bool """
         if isinstance(value, BlowerState):
@@ -109,28 +269,39 @@ class SpaClient():
             key = 'speed'
             cmd = CMD_BLOWER_SPEED
 
-        if bool(await self._connection.send(cmd, value)):
-            self.data.blower.update({key: value})
+        if await self._send(
+            cmd, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set(f'blower.{key}', value)
 
             return True
 
         return False
 
-    async def clean(self) -> bool:
+    async def clean(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ clean: bool """
-        if bool(await self._connection.send(CMD_CLEAN)):
-            self.data.state.update({
-                'clean': OffOnState.OFF
+        if await self._send(CMD_CLEAN, timeout=timeout, deadline=deadline):
+            self.data.set(
+                'state.clean',
+                OffOnState.OFF
                 if self.data.state.clean is OffOnState.ON
                 else OffOnState.ON
-            })
+            )
             return True
 
         return False
 
     async def filtration(
         self,
-        value: Union[FiltrationCycle, FiltrationRuntime]
+        value: Union[FiltrationCycle, FiltrationRuntime],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ filtration: bool """
         if isinstance(value, FiltrationCycle):
@@ -140,16 +311,39 @@ class SpaClient():
             key = 'runtime'
             cmd = CMD_FILTRATION_RUNTIME
 
-        if bool(await self._connection.send(cmd, value)):
-            self.data.settings.filtration.update({key: value})
+        if await self._send(
+            cmd, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set(f'settings.filtration.{key}', value)
 
             return True
 
         return False
 
+    async def get_data(
+        self,
+        max_age: float = DEFAULT_MAX_AGE,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> SpaData:
+        """Return the data, refreshing it if older than max_age seconds."""
+        data: Optional[SpaData] = getattr(self, '_data', None)
+
+        if data is not None and data.age <= max_age:
+            return data
+
+        if not await self.refresh(timeout=timeout, deadline=deadline):
+            raise SpaConnectionError()
+
+        return self._data
+
     async def heat_pump(
         self,
-        value: Union[HeatPumpMode, OffOnState]
+        value: Union[HeatPumpMode, OffOnState],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ heat_pump: bool """
         if isinstance(value, HeatPumpMode):
@@ -159,8 +353,10 @@ class SpaClient():
             key = 'boost'
             cmd = CMD_HEAT_PUMP_BOOST
 
-        if bool(await self._connection.send(cmd, value)):
-            self.data.settings.heat_pump.update({key: value})
+        if await self._send(
+            cmd, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set(f'settings.heat_pump.{key}', value)
 
             return True
 
@@ -174,7 +370,10 @@ class SpaClient():
             LightEffect,
             LightMode,
             OffOnState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ lights_control: bool """
         if isinstance(value, OffOnState):
@@ -193,28 +392,46 @@ class SpaClient():
             key = 'mode'
             cmd = CMD_LIGHTS_MODE
 
-        if bool(await self._connection.send(
+        if await self._send(
             cmd,
-            value if key != 'state' else None
-        )):
-            self.data.lights.update({key: value})
+            value if key != 'state' else None,
+            timeout=timeout,
+            deadline=deadline
+        ):
+            self.data.set(f'lights.{key}', value)
 
             return True
 
         return False
 
-    async def lock_mode(self, value: LockMode) -> bool:
+    async def lock_mode(
+        self,
+        value: LockMode,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ lock_mode: bool """
-        if bool(await self._connection.send(CMD_LOCK_MODE, value)):
-            self.data.settings.update({'lock_mode': value})
+        if await self._send(
+            CMD_LOCK_MODE, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set('settings.lock_mode', value)
             return True
 
         return False
 
-    async def operation_mode(self, value: OperationMode) -> bool:
+    async def operation_mode(
+        self,
+        value: OperationMode,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ operation_mode: bool """
-        if bool(await self._connection.send(CMD_OPERATION_MODE, value)):
-            self.data.state.update({'mode': value})
+        if await self._send(
+            CMD_OPERATION_MODE, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set('state.mode', value)
             return True
 
         return False
@@ -227,13 +444,18 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ pump1_control: bool """
         return await self._pump_control(
-            self.data.pumps.pump1,
+            'pump1',
             CMD_PUMP1,
-            value
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
     async def pump2_control(
@@ -244,13 +466,18 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ pump2_control: bool """
         return await self._pump_control(
-            self.data.pumps.pump2,
+            'pump2',
             CMD_PUMP2,
-            value
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
     async def pump3_control(
@@ -261,13 +488,18 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ pump4_control: bool """
         return await self._pump_control(
-            self.data.pumps.pump3,
+            'pump3',
             CMD_PUMP3,
-            value
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
     async def pump4_control(
@@ -278,13 +510,18 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ pump4_control: bool """
         return await self._pump_control(
-            self.data.pumps.pump4,
+            'pump4',
             CMD_PUMP4,
-            value
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
     async def pump5_control(
@@ -295,58 +532,264 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ pump5_control: bool """
         return await self._pump_control(
-            self.data.pumps.pump5,
+            'pump5',
             CMD_PUMP5,
-            value
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
-    async def refresh(self) -> bool:
-        """ refresh: bool """
-        data = await self._connection.send(CMD_REFRESH)
+    async def refresh(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
+        """Refresh the data.
 
-        if isinstance(data, bool):
-            return False
+        Concurrent callers share one request; each waits no longer than
+        its own timeout or deadline.
+        """
+        deadline = deadline_from(timeout, deadline)
 
-        self._data = SpaData(data)
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh(deadline))
+            self._refreshing.add_done_callback(self._refreshed)
 
-        return True
+            # bounded by the deadline it was started with
+            return await asyncio.shield(self._refreshing)
 
-    async def temperature(self, value: Union[float, int, str]) -> bool:
+        self._refresh_coalesced += 1
+
+        if deadline is None:
+            return await asyncio.shield(self._refreshing)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(self._refreshing),
+                max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            raise SpaTimeoutError(f'no answer to {CMD_REFRESH}') from None
+
+    async def _refresh(self, deadline: Optional[float] = None) -> bool:
+        """ _refresh: bool """
+        self._refresh_count += 1
+
+        try:
+            data = await self._connection.send(CMD_REFRESH, deadline=deadline)
+
+            if isinstance(data, bool):
+                return False
+
+            self._update(data)
+
+            return True
+        finally:
+            # before the done-callbacks, so a caller in between sends RF
+            self._refreshing = None
+
+    def _update(self, data: RFParser) -> None:
+        """Take in a frame read by a refresh or the heartbeat."""
+        old: Optional[SpaData] = getattr(self, '_data', None)
+
+        if old is None:
+            self._data = SpaData(data, lazy=self._config.lazy)
+        else:
+            self._notify(old.apply(data))
+
+    def _notify(self, changes: List[SpaChange]) -> None:
+        if not changes:
+            return
+
+        for listener in list(self._listeners):
+            try:
+                listener(changes)
+            except Exception:
+                _LOGGER.exception("listener failed")
+
+    def _refreshed(self, future: asyncio.Future[bool]) -> None:
+        if self._refreshing is future:  # cancelled before it started
+            self._refreshing = None
+
+        if not future.cancelled():
+            future.exception()  # retrieved by the callers that are left
+
+    def start_polling(
+        self,
+        config: Optional[SpaPollerConfig] = None
+    ) -> SpaPoller:
+        """Start refreshing the data in the background."""
+        if self._poller is None:
+            self._poller = SpaPoller(self, config)
+
+        self._poller.start()
+
+        return self._poller
+
+    async def stop_polling(self) -> None:
+        """Stop refreshing the data in the background."""
+        if self._poller is not None:
+            await self._poller.stop()
+
+        self._poller = None
+
+    def submit(self, path: str, value: Any) -> asyncio.Future[bool]:
+        """Set a field after a short delay, sending only the last value.
+
+        Meant for settings that change rapidly, such as a temperature
+        slider: changes are held back for the config's
+        ``write_behind_window`` and then sent together as by apply().
+        An invalid value raises ValueError at once. The future resolves
+        with whether the value finally sent was acknowledged.
+        """
+        self._command(path, value)
+
+        if self._write_behind is None:
+            self._write_behind = SpaWriteBehind(
+                self, self._config.write_behind_window
+            )
+
+        return self._write_behind.submit(path, value)
+
+    async def temperature(
+        self,
+        value: Union[float, int, str],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ temperature: bool """
         return await self._set_float_coded_integer(
             CMD_TEMPERATURE,
-            self.data.temperature,
-            'target',
-            value
+            'temperature.target',
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
-    async def time_out(self, value: Union[int, str]) -> bool:
+    async def time_out(
+        self,
+        value: Union[int, str],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """ time_out: bool """
         if TimeCodedInteger(value) > 60:
             value = 60
 
         return await self._set_time_coded_integer(
             CMD_TIME_OUT,
-            self.data.settings,
-            'time_out',
-            value
+            'settings.time_out',
+            value,
+            timeout=timeout,
+            deadline=deadline
         )
 
+    def watch(
+        self,
+        *paths: str,
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ) -> SpaSubscription:
+        """Subscribe to changes, optionally only under the given paths.
+
+        ``async for change in client.watch('temperature.water')`` yields
+        a SpaChange whenever a refresh or the poller sees the field change.
+        """
+        def close() -> None:
+            remove()
+            self._subscriptions.remove(subscription)
+
+        subscription = SpaSubscription(paths, maxsize, overflow, close)
+        remove = self.add_listener(subscription.put)
+        self._subscriptions.append(subscription)
+
+        return subscription
+
+    async def _send(
+        self,
+        cmd: str,
+        value: Union[
+            IntEnum,
+            FloatCodedInteger,
+            TimeCodedInteger,
+            None
+        ] = None,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
+        """ _send: bool """
+        if not bool(await self._connection.send(
+            cmd, value, timeout=timeout, deadline=deadline
+        )):
+            return False
+
+        if self._poller is not None:
+            self._poller.kick()
+
+        return True
+
+    def _command(self, path: str, value: Any) -> Tuple[SpaCommand, Any]:
+        """Return the command setting path to value, and the new value."""
+        pump, _, key = path[len('pumps.'):].partition('.')
+
+        if path.startswith('pumps.') and key == 'state' and \
+                pump in PUMP_COMMANDS:
+            profile = self.profile.pumps[pump]
+
+            if profile.installed != OffOnState.ON:
+                raise ValueError(f'{path}: {pump} is not installed')
+
+            if type(value) is not profile.states:
+                raise ValueError(f'{path}: {value!r} is not supported')
+
+            return (PUMP_COMMANDS[pump], value), value
+
+        if path not in SETTINGS:
+            raise ValueError(f'{path}: cannot be set')
+
+        cmd, kind = SETTINGS[path]
+
+        if kind in {FloatCodedInteger, TimeCodedInteger}:
+            try:
+                value = kind(value)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f'{path}: {error}') from None
+
+            if path == 'settings.time_out' and value > 60:
+                value = TimeCodedInteger(60)
+        elif not isinstance(value, kind):
+            raise ValueError(f'{path}: {value!r} is not a {kind.__name__}')
+
+        if path == 'lights.state':
+            cmd = CMD_LIGHTS_ON if value == OffOnState.ON else CMD_LIGHTS_OFF
+            return (cmd, None), value
+
+        return (cmd, value), value
+
     async def _set_float_coded_integer(
         self,
         cmd: str,
-        obj: MyDict,
-        key: str,
-        value: Union[float, int, str]
+        path: str,
+        value: Union[float, int, str],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         _fci = FloatCodedInteger(value)
 
-        if bool(await self._connection.send(cmd, _fci)):
-            obj.update({key: _fci})
+        if await self._send(cmd, _fci, timeout=timeout, deadline=deadline):
+            self.data.set(path, _fci)
             return True
 
         return False
@@ -354,21 +797,23 @@ class SpaClient():
     async def _set_time_coded_integer(
         self,
         cmd: str,
-        obj: MyDict,
-        key: str,
-        value: Union[int, str]
+        path: str,
+        value: Union[int, str],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         _tci = TimeCodedInteger(value)
 
-        if bool(await self._connection.send(cmd, _tci)):
-            obj.update({key: _tci})
+        if await self._send(cmd, _tci, timeout=timeout, deadline=deadline):
+            self.data.set(path, _tci)
             return True
 
         return False
 
     async def _pump_control(
         self,
-        pump: PumpDict,
+        name: str,
         cmd: str,
         value: Union[
             OffOnState,
@@ -376,17 +821,24 @@ class SpaClient():
             OffHighLowState,
             OffLowAutoState,
             HighLowState
-        ]
+        ],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> bool:
         """ _pump_control: bool """
+        pump = self.profile.pumps[name]
+
         if pump.installed != OffOnState.ON:
             return False
 
-        if type(pump.state) != type(value):
+        if type(value) is not pump.states:
             return False
 
-        if bool(await self._connection.send(cmd, value)):
-            pump.update({'state': value})
+        if await self._send(
+            cmd, value, timeout=timeout, deadline=deadline
+        ):
+            self.data.set(f'pumps.{name}.state', value)
 
             return True
 
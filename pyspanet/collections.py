@@ -2,8 +2,18 @@
 from __future__ import annotations
 
 from builtins import type
-from collections import UserDict
-from typing import Any, Optional, Union
+from collections.abc import Mapping, MutableMapping
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from .enums import (
     BlowerSpeed,
@@ -31,16 +41,98 @@ from .enums import (
 
 NoneType = type(None)
 
+# temperatures the spa reports, 0-60 degrees in tenths
+FCI_INTERN_MAX = 600
+# 23:59 as hours * 256 + minutes
+TCI_MAX = 5947
+
+_MyDictT = TypeVar('_MyDictT', bound='MyDict')
+
+
+class MyDict(MutableMapping):
+    """ MyDict
+
+    Record with a fixed set of keys stored in ``__slots__``. Keys are read
+    as attributes and the record can be used as a mapping; a key that has
+    not been set is missing from the mapping.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        fields: List[str] = []
+
+        for base in reversed(cls.__mro__):
+            for name in base.__dict__.get('__slots__', ()):
+                if name not in fields:
+                    fields.append(name)
+
+        cls._fields = tuple(fields)
+
+    def __init__(
+        self,
+        data: Optional[Mapping[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        if data is not None:
+            self.update(data)
+
+        if kwargs:
+            self.update(kwargs)
+
+    @classmethod
+    def wrap(cls: Type[_MyDictT], data: Dict[str, Any]) -> _MyDictT:
+        """Create a record from a dict of decoded values."""
+        self = cls.__new__(cls)
+
+        for key, value in data.items():
+            setattr(self, key, value)
+
+        return self
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
 
-class MyDict(UserDict):
-    """ MyDict """
-    def __getattr__(self, arg: Any) -> Optional[Any]:
         try:
-            result = self.data[arg]
-        except KeyError as error:
-            raise AttributeError from error
+            return object.__getattribute__(self, key)
+        except AttributeError as error:
+            raise KeyError(key) from error
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+
+        try:
+            delattr(self, key)
+        except AttributeError as error:
+            raise KeyError(key) from error
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                continue
 
-        return result
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def copy(self) -> MyDict:
+        """Return a shallow copy of the record."""
+        return self.wrap(dict(self.items()))
 
 
 ###############################################################################
@@ -49,6 +141,11 @@ class MyDict(UserDict):
 
 class BlowerDict(MyDict):
     """ BlowerDict """
+    __slots__ = (
+        'speed',
+        'state',
+    )
+
     speed: BlowerSpeed
     state: BlowerState
 
@@ -59,6 +156,15 @@ class BlowerDict(MyDict):
 
 class DateTimeDict(MyDict):
     """ DateTimeDict """
+    __slots__ = (
+        'hours',
+        'minutes',
+        'seconds',
+        'day',
+        'month',
+        'year',
+    )
+
     hours: int
     minutes: int
     seconds: int
@@ -73,6 +179,11 @@ class DateTimeDict(MyDict):
 
 class DeviceDict(MyDict):
     """ DeviceDict """
+    __slots__ = (
+        'model',
+        'software',
+    )
+
     model: str
     software: str
 
@@ -83,6 +194,11 @@ class DeviceDict(MyDict):
 
 class FiltrationDict(MyDict):
     """ FiltrationDict """
+    __slots__ = (
+        'cycle',
+        'runtime',
+    )
+
     cycle: FiltrationCycle
     runtime: FiltrationRuntime
 
@@ -92,15 +208,38 @@ class FiltrationDict(MyDict):
 ###############################################################################
 
 class FloatCodedInteger(int):
-    """ FloatCodedInteger """
-    def __new__(cls, value: Union[int, float, str]) -> FloatCodedInteger:
+    """ FloatCodedInteger
+
+    Compares and hashes as its integer value, so it can be used as a dict
+    or set key. Use matches() to compare with a float or string such as
+    28.6 or '28.6'. Values up to FCI_INTERN_MAX are interned.
+    """
+    __slots__ = ()
+    _interned: Dict[int, FloatCodedInteger] = {}
+
+    def __new__(
+        cls,
+        value: Union[int, float, str, bytes]
+    ) -> FloatCodedInteger:
         if isinstance(value, float):
             value = int(value * 10)
         elif isinstance(value, str) and not value.isnumeric():
             if value.replace('.', '').isnumeric():
                 value = int(float(value) * 10)
 
-        return super(FloatCodedInteger, cls).__new__(cls, value)
+        number = int(value)
+
+        if cls is not FloatCodedInteger or \
+                not 0 <= number <= FCI_INTERN_MAX:
+            return super(FloatCodedInteger, cls).__new__(cls, number)
+
+        self = cls._interned.get(number)
+
+        if self is None:
+            self = super(FloatCodedInteger, cls).__new__(cls, number)
+            cls._interned[number] = self
+
+        return self
 
     def __float__(self) -> float:
         return float(int(self) / 10)
@@ -108,14 +247,15 @@ class FloatCodedInteger(int):
     def __str__(self) -> str:
         return str(float(self))
 
-    def __eq__(self, value: object) -> bool:
+    def matches(self, value: Union[int, float, str]) -> bool:
+        """Return whether value is this temperature, e.g. 28.6 or '28.6'."""
         if isinstance(value, float):
             return float(self) == value
 
         if isinstance(value, str):
-            return str(value) == value
+            return str(self) == value
 
-        return super().__eq__(value)
+        return int(self) == value
 
 
 ###############################################################################
@@ -124,6 +264,11 @@ class FloatCodedInteger(int):
 
 class HeatPumpDict(MyDict):
     """ HeatPumpDict """
+    __slots__ = (
+        'boost',
+        'mode',
+    )
+
     boost: OffOnState
     mode: HeatPumpMode
 
@@ -134,6 +279,14 @@ class HeatPumpDict(MyDict):
 
 class LightDict(MyDict):
     """ LightDict """
+    __slots__ = (
+        'brightness',
+        'colour',
+        'effect',
+        'mode',
+        'state',
+    )
+
     brightness: LightBrightness
     colour: LightColour
     effect: LightEffect
@@ -141,12 +294,36 @@ class LightDict(MyDict):
     state: OffOnState
 
 
+###############################################################################
+# PowerDict
+###############################################################################
+
+class PowerDict(MyDict):
+    """ PowerDict """
+    __slots__ = (
+        'current',
+        'current_limit',
+        'heat_element_current',
+        'voltage',
+    )
+
+    current: int
+    current_limit: int
+    heat_element_current: int
+    voltage: int
+
+
 ###############################################################################
 # PowerSaveDict
 ###############################################################################
 
 class PowerSaveDict(MyDict):
     """ PowerSaveDict """
+    __slots__ = (
+        'state',
+        'peak',
+    )
+
     state: PowerSave
     peak: StartStopDict
 
@@ -157,6 +334,12 @@ class PowerSaveDict(MyDict):
 
 class PumpDict(MyDict):
     """ PumpDict """
+    __slots__ = (
+        'installed',
+        'speed',
+        'state',
+    )
+
     installed: OffOnState
     speed: PumpType
     state: Union[
@@ -168,16 +351,12 @@ class PumpDict(MyDict):
         NoneType
     ]
 
-    def __getattr__(self, arg: Any) -> Optional[Any]:
-        try:
-            result = self.data[arg]
-        except KeyError as error:
-            if arg in ['speed', 'state']:
-                return None
-
-            raise AttributeError from error
+    def __getattr__(self, arg: str) -> Optional[Any]:
+        # only reached when a slot has not been set
+        if arg in ('speed', 'state'):
+            return None
 
-        return result
+        raise AttributeError(arg)
 
 
 ###############################################################################
@@ -186,6 +365,14 @@ class PumpDict(MyDict):
 
 class PumpsDict(MyDict):
     """ PumpsDict """
+    __slots__ = (
+        'pump1',
+        'pump2',
+        'pump3',
+        'pump4',
+        'pump5',
+    )
+
     pump1: PumpDict
     pump2: PumpDict
     pump3: PumpDict
@@ -199,6 +386,17 @@ class PumpsDict(MyDict):
 
 class SettingDict(MyDict):
     """ SettingDict """
+    __slots__ = (
+        'auto_clean',
+        'datetime',
+        'filtration',
+        'heat_pump',
+        'lock_mode',
+        'power_save',
+        'sleep',
+        'time_out',
+    )
+
     auto_clean: TimeCodedInteger
     datetime: DateTimeDict
     filtration: FiltrationDict
@@ -215,6 +413,12 @@ class SettingDict(MyDict):
 
 class SleepDict(MyDict):
     """ SleepDict """
+    __slots__ = (
+        'awake_remaining',
+        'timer1',
+        'timer2',
+    )
+
     awake_remaining: int
     timer1: SleepTimerDict
     timer2: SleepTimerDict
@@ -226,6 +430,11 @@ class SleepDict(MyDict):
 
 class StartStopDict(MyDict):
     """ StartStopDict """
+    __slots__ = (
+        'start',
+        'stop',
+    )
+
     start: TimeCodedInteger
     stop: TimeCodedInteger
 
@@ -236,6 +445,8 @@ class StartStopDict(MyDict):
 
 class SleepTimerDict(StartStopDict):
     """ SleepTimerDict """
+    __slots__ = ('state',)
+
     state: SleepTimer
 
 
@@ -245,6 +456,17 @@ class SleepTimerDict(StartStopDict):
 
 class StateDict(MyDict):
     """ StateDict """
+    __slots__ = (
+        'auto',
+        'clean',
+        'heat',
+        'label',
+        'mode',
+        'sleep',
+        'uv',
+        'water',
+    )
+
     auto: OffOnState
     clean: OffOnState
     heat: OffOnState
@@ -261,6 +483,12 @@ class StateDict(MyDict):
 
 class TemperatureDict(MyDict):
     """ TemperatureDict """
+    __slots__ = (
+        'heater',
+        'target',
+        'water',
+    )
+
     heater: FloatCodedInteger
     target: FloatCodedInteger
     water: FloatCodedInteger
@@ -271,20 +499,35 @@ class TemperatureDict(MyDict):
 ###############################################################################
 
 class TimeCodedInteger(int):
-    """ TimeCodedInteger """
-    def __new__(cls, value: Union[int, float, str]) -> TimeCodedInteger:
+    """ TimeCodedInteger
+
+    Compares and hashes as its integer value, so it can be used as a dict
+    or set key. Use matches() to compare with a time string such as
+    '22:00'. Every value in range is interned.
+    """
+    __slots__ = ()
+    _interned: Dict[int, TimeCodedInteger] = {}
+
+    def __new__(
+        cls,
+        value: Union[int, float, str, bytes]
+    ) -> TimeCodedInteger:
         if isinstance(value, str) and not value.isnumeric():
             if value.replace(':', '').isnumeric():
                 hours, minutes = value.split(':', 1)
                 value = int(hours) * 256 + int(minutes)
 
-        self = super(TimeCodedInteger, cls).__new__(cls, value)
+        number = min(max(int(value), 0), TCI_MAX)
+
+        if cls is not TimeCodedInteger:
+            return super(TimeCodedInteger, cls).__new__(cls, number)
+
+        self = cls._interned.get(number)
+
+        if self is None:
+            self = super(TimeCodedInteger, cls).__new__(cls, number)
+            cls._interned[number] = self
 
-        if isinstance(self, TimeCodedInteger):
-            if self < 0:
-                return TimeCodedInteger(0)
-            elif self > 5947:
-                return TimeCodedInteger(5947)
         return self
 
     def __str__(self) -> str:
@@ -293,8 +536,9 @@ class TimeCodedInteger(int):
 
         return f'{hours}:{minutes:02}'
 
-    def __eq__(self, value: object) -> bool:
+    def matches(self, value: Union[int, str]) -> bool:
+        """Return whether value is this time, e.g. '22:00'."""
         if isinstance(value, str):
             return str(self) == value
 
-        return super().__eq__(value)
+        return int(self) == value
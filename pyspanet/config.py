@@ -1,9 +1,37 @@
 """ SpaConfig class """
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from .reconnect import SpaReconnectConfig
 
 
 @dataclass
 class SpaConfig():
-    """ Spa config """
+    """ Spa config
+
+    Subclasses read these fields from their config dict, see options().
+    In the dict ``reconnect`` may be given as SpaReconnectConfig fields.
+    ``write_behind_window`` is how long SpaClient.submit() holds back
+    changes to a field before sending only the last value, in seconds.
+    """
+    lazy: bool = False
+    keepalive: bool = True
+    heartbeat_interval: Optional[float] = None
+    reconnect: Optional[SpaReconnectConfig] = None
+    write_behind_window: float = 0.25
+
+
+def options(config: dict) -> Dict[str, Any]:
+    """Return the SpaConfig fields set in a config dict."""
+    result = {
+        field.name: config[field.name]
+        for field in fields(SpaConfig)
+        if field.name in config
+    }
+
+    if isinstance(result.get('reconnect'), dict):
+        result['reconnect'] = SpaReconnectConfig(**result['reconnect'])
+
+    return result
@@ -1,11 +1,13 @@
 """ SpaConnection class """
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from abc import abstractmethod
 from builtins import type
 from enum import IntEnum
-from typing import Optional, Union
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 from .collections import FloatCodedInteger, TimeCodedInteger
 from .const import (
@@ -20,31 +22,140 @@ from .const import (
     CMD_PUMP5,
     CMD_REFRESH,
 )
+from .enums import BreakerState
+from .exceptions import SpaCircuitOpenError, SpaTimeoutError
+from .framing import SpaFrame
+from .parser import RFParser
+from .reconnect import SpaReconnectConfig, SpaReconnectPolicy
 
 NoneType = type(None)
 
+SpaCommand = Tuple[
+    str,
+    Union[IntEnum, FloatCodedInteger, TimeCodedInteger, NoneType]
+]
+SpaRequest = Tuple[
+    Tuple[str, ...],
+    float,
+    'asyncio.Future[List[Optional[SpaFrame]]]'
+]
+
+# seconds allowed for a command when the caller sets no timeout, a
+# refresh transfers the whole RF frame so it is allowed longer
+DEFAULT_TIMEOUT = 5.0
+REFRESH_TIMEOUT = 15.0
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def deadline_from(
+    timeout: Optional[float],
+    deadline: Optional[float]
+) -> Optional[float]:
+    """Return the earlier of deadline and timeout seconds from now."""
+    if timeout is None:
+        return deadline
+
+    expiry = time.monotonic() + timeout
+
+    return expiry if deadline is None else min(deadline, expiry)
+
+
+def remaining(deadline: float) -> float:
+    """Return the seconds left until deadline."""
+    return max(deadline - time.monotonic(), 0.0)
+
+
 class SpaConnection():
-    """Spa connection."""
+    """Spa connection.
+
+    The connection state is tracked from the outcome of every read and
+    write rather than probed. With a ``heartbeat_interval`` a refresh is
+    sent whenever the link has been idle that long, so a dead link is
+    noticed in the background instead of on the next command. The frame
+    it reads is passed to the callback set with on_refresh(), so the
+    probe doubles as a refresh.
 
-    # def __init__(self, config: SpaConfig) -> None:
-    #     self._config: SpaConfig
+    A dropped link is reconnected on the next command, or by the
+    heartbeat, as far as the reconnect policy allows: attempts back off
+    with jitter and while the circuit breaker is open callers fail fast
+    with SpaCircuitOpenError.
+    """
 
-    #     self._config = config
+    def __init__(
+        self,
+        heartbeat_interval: Optional[float] = None,
+        reconnect: Optional[SpaReconnectConfig] = None
+    ) -> None:
+        self._policy = SpaReconnectPolicy(reconnect)
+        self._queue: Optional[asyncio.Queue[SpaRequest]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._in_flight: Optional[SpaRequest] = None
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat: Optional[asyncio.Task[None]] = None
+        self._on_refresh: Optional[Callable[[RFParser], None]] = None
+        self._last_seen = 0.0
 
     @property
     def connected(self) -> bool:
         """ Spa is connected"""
         return self._connected
 
-    async def connect(self) -> bool:
+    @property
+    def breaker_state(self) -> BreakerState:
+        """Return the state of the reconnect circuit breaker."""
+        return self._policy.state
+
+    @property
+    def last_seen(self) -> float:
+        """Return the monotonic time the spa last answered."""
+        return self._last_seen
+
+    def on_refresh(
+        self,
+        callback: Optional[Callable[[RFParser], None]]
+    ) -> None:
+        """Pass every frame the heartbeat reads to callback."""
+        self._on_refresh = callback
+
+    async def connect(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> bool:
         """Connect to the spa."""
-        return await self._connect()
+        deadline = deadline_from(timeout, deadline)
+
+        if deadline is None:
+            deadline = time.monotonic() + DEFAULT_TIMEOUT
+
+        try:
+            connected = await asyncio.wait_for(
+                self._connect(), remaining(deadline)
+            )
+        except asyncio.TimeoutError:
+            await self._disconnect()
+            connected = False
+
+        if not connected:
+            self._policy.failure()
+            return False
+
+        self._last_seen = time.monotonic()
+
+        if self._heartbeat_interval and \
+                (self._heartbeat is None or self._heartbeat.done()):
+            self._heartbeat = asyncio.ensure_future(
+                self._beat(self._heartbeat_interval)
+            )
+
+        return True
 
     async def disconnect(self) -> None:
         """Disconnect from the spa."""
+        await self._stop_heartbeat()
+        await self._stop_worker()
         await self._disconnect()
 
     async def send(
@@ -55,26 +166,90 @@ class SpaConnection():
             FloatCodedInteger,
             TimeCodedInteger,
             NoneType
-        ] = None
-    ) -> Union[bool, str]:
-        """ Send a command to the spa"""
-        if not self.connected:
+        ] = None,
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> Union[bool, RFParser]:
+        """ Send a command to the spa
+
+        Returns whether the spa acknowledged the command, or for
+        CMD_REFRESH the RFParser holding the response. Raises
+        SpaTimeoutError if the spa has not answered by the deadline.
+        """
+        deadline = deadline_from(timeout, deadline)
+
+        if deadline is None:
+            deadline = time.monotonic() + (
+                REFRESH_TIMEOUT if cmd == CMD_REFRESH else DEFAULT_TIMEOUT
+            )
+
+        if not self.connected and not await self._reconnect(deadline):
             return False
 
         _LOGGER.debug("Send: %s", cmd)
 
         msg = self._build_msg(cmd, value)
-        result = await self._send(msg)
+        result = await self._submit(msg, deadline)
 
         _LOGGER.debug("Received: %s", result)
 
-        if result is None or (
-            result.startswith(CMD_REFRESH) and cmd != CMD_REFRESH
-        ):
-            return False
+        return self._acknowledged(cmd, value, result)
+
+    async def send_many(
+        self,
+        commands: Sequence[SpaCommand],
+        *,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> List[bool]:
+        """Send several commands back to back.
+
+        The commands are written together and the answers read in order,
+        so the batch takes about one round trip instead of one each.
+        Returns whether each command was acknowledged.
+        """
+        deadline = deadline_from(timeout, deadline)
+
+        if deadline is None:
+            deadline = time.monotonic() + DEFAULT_TIMEOUT
+
+        if not commands:
+            return []
+
+        if not self.connected and not await self._reconnect(deadline):
+            return [False] * len(commands)
+
+        msgs = tuple(self._build_msg(cmd, value) for cmd, value in commands)
+
+        _LOGGER.debug("Send: %s", msgs)
+
+        results = await self._submit_many(msgs, deadline)
+
+        _LOGGER.debug("Received: %s", results)
+
+        return [
+            bool(self._acknowledged(cmd, value, result))
+            for (cmd, value), result in zip(commands, results)
+        ]
+
+    @staticmethod
+    def _acknowledged(
+        cmd: str,
+        value: Union[
+            IntEnum,
+            FloatCodedInteger,
+            TimeCodedInteger,
+            NoneType
+        ],
+        result: Optional[SpaFrame]
+    ) -> Union[bool, RFParser]:
+        """Return whether result is the spa's answer to the command."""
+        if isinstance(result, RFParser):
+            return result if cmd == CMD_REFRESH else False
 
-        if cmd == CMD_REFRESH:
-            return str(result)
+        if result is None or cmd == CMD_REFRESH:
+            return False
 
         if cmd in {
             CMD_BLOWER,
@@ -84,12 +259,15 @@ class SpaConnection():
             CMD_PUMP4,
             CMD_PUMP5
         }:
-            return result.strip() == f'{cmd}-OK'
+            return result.strip() == f'{cmd}-OK'.encode()
 
         if cmd in {CMD_CLEAN, CMD_LIGHTS_OFF, CMD_LIGHTS_ON}:
-            return result.strip() == cmd
+            return result.strip() == cmd.encode()
 
-        return int(result.strip()) == value
+        try:
+            return int(result.strip()) == value
+        except ValueError:
+            return False  # e.g. an error message instead of the value
 
     def _build_msg(
         self,
@@ -106,6 +284,160 @@ class SpaConnection():
 
         return f'{cmd}:{int(value)}'
 
+    async def _submit(self, msg: str, deadline: float) -> Optional[SpaFrame]:
+        """Queue a message and wait for the spa to answer it."""
+        return (await self._submit_many((msg,), deadline))[0]
+
+    async def _submit_many(
+        self,
+        msgs: Tuple[str, ...],
+        deadline: float
+    ) -> List[Optional[SpaFrame]]:
+        """Queue messages as one request and wait for every answer."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run(self._queue))
+
+        future: asyncio.Future[List[Optional[SpaFrame]]] = \
+            asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((msgs, deadline, future))
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), remaining(deadline)
+            )
+        except asyncio.TimeoutError:
+            if self._in_flight is None or future is not self._in_flight[2]:
+                future.cancel()  # still queued, the worker skips it
+                raise SpaTimeoutError(
+                    f'no answer to {", ".join(msgs)}'
+                ) from None
+
+        # the transport gives up at the same deadline and resets the link
+        return await future
+
+    async def _run(self, queue: asyncio.Queue[SpaRequest]) -> None:
+        """Send queued requests one at a time, in order."""
+        while True:
+            request = await queue.get()
+            msgs, deadline, future = request
+
+            if future.done():
+                continue  # caller gave up waiting
+
+            self._in_flight = request
+
+            try:
+                if len(msgs) == 1:
+                    results = [await self._send(msgs[0], deadline)]
+                else:
+                    results = await self._send_many(msgs, deadline)
+            except Exception as error:
+                if isinstance(error, SpaTimeoutError):
+                    self._policy.failure()
+
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if None in results:
+                    self._policy.failure()
+                else:
+                    self._policy.success()
+                    self._last_seen = time.monotonic()
+
+                if not future.done():
+                    future.set_result(results)
+            finally:
+                self._in_flight = None
+
+    async def _reconnect(self, deadline: Optional[float] = None) -> bool:
+        """Connect again if the reconnect policy allows it now."""
+        if self._policy.state == BreakerState.OPEN:
+            raise SpaCircuitOpenError(self._policy.retry_after)
+
+        if not self._policy.allow():
+            return False
+
+        _LOGGER.debug("Reconnecting, %s failures", self._policy.failures)
+
+        return await self.connect(deadline=deadline)
+
+    async def _beat(self, interval: float) -> None:
+        """Probe the spa whenever the link has been idle for interval."""
+        while True:
+            idle = time.monotonic() - self._last_seen
+            await asyncio.sleep(max(interval - idle, 0) or interval)
+
+            if not self.connected:
+                try:
+                    await self._reconnect()
+                except SpaCircuitOpenError:
+                    pass
+
+                continue
+
+            if time.monotonic() - self._last_seen < interval:
+                continue  # commands kept the link busy
+
+            try:
+                result = await self._submit(
+                    CMD_REFRESH, time.monotonic() + REFRESH_TIMEOUT
+                )
+            except SpaTimeoutError:
+                result = None
+            except Exception:
+                _LOGGER.exception("Heartbeat failed")
+                continue
+
+            if result is None:
+                _LOGGER.debug("Heartbeat: no answer")
+                continue
+
+            if isinstance(result, RFParser) and self._on_refresh is not None:
+                try:
+                    self._on_refresh(result)
+                except Exception:
+                    _LOGGER.exception("Heartbeat refresh callback failed")
+
+    async def _stop_heartbeat(self) -> None:
+        heartbeat = self._heartbeat
+        self._heartbeat = None
+
+        if heartbeat is not None and not heartbeat.done():
+            heartbeat.cancel()
+
+            try:
+                await heartbeat
+            except asyncio.CancelledError:
+                pass
+
+    async def _stop_worker(self) -> None:
+        """Stop the writer task and release every waiting caller."""
+        worker, queue, in_flight = self._worker, self._queue, self._in_flight
+
+        self._worker = None
+        self._queue = None
+        self._in_flight = None
+
+        if worker is not None and not worker.done():
+            worker.cancel()
+
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+        if in_flight is not None and not in_flight[2].done():
+            in_flight[2].set_result([None] * len(in_flight[0]))
+
+        while queue is not None and not queue.empty():
+            msgs, _, future = queue.get_nowait()
+
+            if not future.done():
+                future.set_result([None] * len(msgs))
+
     @property
     @abstractmethod
     def _connected(self) -> bool: ...
@@ -117,4 +449,30 @@ class SpaConnection():
     async def _disconnect(self) -> None: ...
 
     @abstractmethod
-    async def _send(self, msg: str) -> Optional[str]: ...
+    async def _send(self, msg: str, deadline: float) -> Optional[SpaFrame]:
+        """Send a message and read the answer, by the monotonic deadline.
+
+        Raises SpaTimeoutError, after resetting the link, when the answer
+        does not arrive in time.
+        """
+
+    async def _send_many(
+        self,
+        msgs: Tuple[str, ...],
+        deadline: float
+    ) -> List[Optional[SpaFrame]]:
+        """Send messages and read their answers, by the deadline.
+
+        Sends one message at a time unless the transport can pipeline
+        them. Messages after the first unanswered one are not sent.
+        """
+        results: List[Optional[SpaFrame]] = []
+
+        for msg in msgs:
+            result = await self._send(msg, deadline)
+            results.append(result)
+
+            if result is None:
+                break
+
+        return results + [None] * (len(msgs) - len(results))
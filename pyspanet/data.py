@@ -1,90 +1,80 @@
 """ SpaData class """
 from __future__ import annotations
 
+import copy
 import logging
-import re
-from builtins import type
-from typing import Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from .collections import (
     BlowerDict,
-    DateTimeDict,
     DeviceDict,
-    FiltrationDict,
-    FloatCodedInteger,
-    HeatPumpDict,
     LightDict,
-    PowerSaveDict,
-    PumpDict,
+    MyDict,
+    PowerDict,
     PumpsDict,
     SettingDict,
-    SleepDict,
-    SleepTimerDict,
-    StartStopDict,
     StateDict,
     TemperatureDict,
-    TimeCodedInteger,
 )
 from .const import CMD_REFRESH
-from .enums import (
-    BlowerSpeed,
-    BlowerState,
-    FiltrationCycle,
-    FiltrationRuntime,
-    HeatPumpMode,
-    HighLowState,
-    LightBrightness,
-    LightColour,
-    LightEffect,
-    LightMode,
-    LockMode,
-    MonthEnum,
-    OffHighLowState,
-    OffLowAutoState,
-    OffOnAutoState,
-    OffOnState,
-    OperationMode,
-    PowerSave,
-    PumpType,
-    SleepTimer,
-    StateLabel,
+from .diff import SpaChange, diff, diff_values
+from .enums import OffOnState
+from .exceptions import SpaMessageError
+from .parser import RFParser
+from .profile import SpaProfile
+from .raw import SpaRaw
+from .schema import (
+    R3,
+    RG,
+    SCHEMA,
+    SCHEMAS,
+    Records,
+    SpaField,
+    SpaSchema,
+    split_records,
 )
 
-R2 = 'R2'
-R3 = 'R3'
-R4 = 'R4'
-R5 = 'R5'
-R6 = 'R6'
-R7 = 'R7'
-R9 = 'R9'
-RA = 'RA'
-RB = 'RB'
-RC = 'RC'
-RE = 'RE'
-RG = 'RG'
-
-NoneType = type(None)
-
 _LOGGER = logging.getLogger(__name__)
 
 
 class SpaData():
-    """ SpaData """
-    def __init__(self, data: str) -> None:
-        self._blower: BlowerDict
-        self._device: DeviceDict
-        self._lights: LightDict
-        self._pumps: PumpsDict
-        self._settings: SettingDict
-        self._state: StateDict
-        self._temperature: TemperatureDict
-
-        self._parse(data)
+    """ SpaData
+
+    With ``lazy`` set the frame is only split into records up front and
+    each section (``settings``, ``pumps``, ...) is decoded the first time
+    it is accessed.
+    """
+    def __init__(
+        self,
+        data: Union[str, bytes, memoryview, RFParser],
+        lazy: bool = False
+    ) -> None:
+        self._records: Records = {}
+        self._schema = SCHEMA
+        self._lazy = lazy
+        self._sections: Dict[str, MyDict] = {}
+        self._dirty: Set[str] = set()
+        self._profile: Optional[SpaProfile] = None
+        self._raw: Optional[SpaRaw] = None
+        self._timestamp = time.monotonic()
+
+        self._parse(data, lazy)
+
+    @property
+    def age(self) -> float:
+        """Return the number of seconds since the snapshot was taken."""
+        return time.monotonic() - self._timestamp
+
+    @property
+    def timestamp(self) -> float:
+        """Return the monotonic time the snapshot was taken."""
+        return self._timestamp
 
     @property
     def blower(self) -> BlowerDict:
         """Return the blower."""
-        return self._blower
+        return self._section('blower')  # type: ignore
 
     @property
     def cleaning(self) -> OffOnState:
@@ -94,7 +84,7 @@ class SpaData():
     @property
     def device(self) -> Optional[DeviceDict]:
         """Return the device."""
-        return self._device
+        return self._section('device')  # type: ignore
 
     @property
     def heating(self) -> OffOnState:
@@ -104,17 +94,38 @@ class SpaData():
     @property
     def lights(self) -> LightDict:
         """Return the lights."""
-        return self._lights
+        return self._section('lights')  # type: ignore
+
+    @property
+    def power(self) -> PowerDict:
+        """Return the power."""
+        return self._section('power')  # type: ignore
+
+    @property
+    def profile(self) -> SpaProfile:
+        """Return the capabilities of the spa."""
+        if self._profile is None:
+            self._profile = self._schema.profile(self._records)
+
+        return self._profile
 
     @property
     def pumps(self) -> PumpsDict:
         """Return the pumps."""
-        return self._pumps
+        return self._section('pumps')  # type: ignore
+
+    @property
+    def raw(self) -> SpaRaw:
+        """Return every value of the frame as integer arrays."""
+        if self._raw is None:
+            self._raw = SpaRaw(self._records, self._schema)
+
+        return self._raw
 
     @property
     def settings(self) -> SettingDict:
         """Return the settings."""
-        return self._settings
+        return self._section('settings')  # type: ignore
 
     @property
     def sleeping(self) -> OffOnState:
@@ -124,12 +135,12 @@ class SpaData():
     @property
     def state(self) -> StateDict:
         """Return the pumps."""
-        return self._state
+        return self._section('state')  # type: ignore
 
     @property
     def temperature(self) -> TemperatureDict:
         """Return the pumps."""
-        return self._temperature
+        return self._section('temperature')  # type: ignore
 
     @property
     def target_temperature(self) -> float:
@@ -141,150 +152,161 @@ class SpaData():
         """Return the water temperature."""
         return self.temperature.water
 
-    def _parse(self, data: str) -> None:
-        lines = re.split(r',?:\*?\r?\n,?', data)
+    def apply(
+        self,
+        data: Union[str, bytes, memoryview, RFParser]
+    ) -> List[SpaChange]:
+        """Update the snapshot in place from a newer frame.
+
+        Only fields whose record values changed, or that were changed
+        locally through set(), are decoded again. Returns the changes.
+        """
+        records = self._split(data)
+
+        if next(iter(records), None) != CMD_REFRESH:
+            raise SpaMessageError('not an RF response')
+
+        schema = SCHEMAS.select(records)
+
+        if schema is not self._schema:
+            return self._relayout(schema, records)
+
+        specs = schema.changed(self._records, records)
 
-        if lines[0] != CMD_REFRESH:
+        for path in self._dirty:
+            spec = schema.lookup(path)
+
+            if spec is not None and spec not in specs:
+                specs.append(spec)
+
+        # decode everything before touching the snapshot
+        updates: List[Tuple[SpaField, Any]] = [
+            (spec, schema.decode_field(spec, records)) for spec in specs
+        ]
+        changes: List[SpaChange] = []
+
+        for spec, value in updates:
+            section = spec.path.partition('.')[0]
+
+            if section in self._sections:
+                container, key = self._container(spec.path)
+                old = container[key]
+                container[key] = value
+            else:
+                old = self._decode_old(spec)
+
+            diff_values(spec.path, old, value, changes)
+
+        if self._records.get(R3) != records.get(R3) or \
+                self._records.get(RG) != records.get(RG):
+            self._profile = None  # derived again on next access
+
+        self._records = records
+        self._raw = None
+        self._dirty.clear()
+        self._timestamp = time.monotonic()
+
+        return changes
+
+    def diff(self, other: Optional[SpaData]) -> List[SpaChange]:
+        """Return the fields that changed since the other snapshot."""
+        return diff(other, self)
+
+    @property
+    def schema(self) -> SpaSchema:
+        """Return the field layout selected for the spa."""
+        return self._schema
+
+    def set(self, path: str, value: Any) -> None:
+        """Set a field locally, e.g. after a command was acknowledged.
+
+        The field is decoded again from the next frame passed to apply().
+        """
+        container, key = self._container(path)
+        container[key] = value
+        self._dirty.add(path)
+
+    def _relayout(
+        self,
+        schema: SpaSchema,
+        records: Records
+    ) -> List[SpaChange]:
+        """Decode with another layout, e.g. after a software update."""
+        previous = copy.copy(self)
+
+        self._schema = schema
+        self._records = records
+        self._sections = {} if self._lazy else schema.decode(records)
+        self._profile = None
+        self._raw = None
+        self._dirty.clear()
+        self._timestamp = time.monotonic()
+
+        return diff(previous, self)
+
+    def _decode_old(self, spec: SpaField) -> Any:
+        """Decode the previous value of a field in an undecoded section."""
+        try:
+            return self._schema.decode_field(spec, self._records)
+        except SpaMessageError:
+            return None
+
+    def _container(self, path: str) -> Tuple[MyDict, str]:
+        parts = path.split('.')
+        container = self._section(parts[0])
+
+        for part in parts[1:-1]:
+            container = container[part]
+
+        return container, parts[-1]
+
+    @staticmethod
+    def _split(data: Union[str, bytes, memoryview, RFParser]) -> Records:
+        if isinstance(data, RFParser):
+            return data.records()
+
+        if isinstance(data, str):
+            return split_records(data.encode())
+
+        if isinstance(data, memoryview):
+            return split_records(data.tobytes())
+
+        return split_records(data)
+
+    def _parse(
+        self,
+        data: Union[str, bytes, memoryview, RFParser],
+        lazy: bool
+    ) -> None:
+        records = self._split(data)
+
+        if next(iter(records), None) != CMD_REFRESH:
             return
 
-        info = {}
-
-        for line in lines:
-            if line in ('', line == CMD_REFRESH):
-                continue
-
-            items = line.split(',')
-            key = items.pop(0)
-            info[key] = items
-
-        self._blower = BlowerDict({
-            'speed': BlowerSpeed(int(info[R6][0])),
-            'state': BlowerState(int(info[RC][9]))
-        })
-
-        self._settings = SettingDict({
-            'auto_clean': TimeCodedInteger(info[R7][0]),
-            'datetime': DateTimeDict({
-                'hours': int(info[R2][5]),
-                'minutes': int(info[R2][6]),
-                'seconds': int(info[R2][7]),
-                'day': int(info[R2][8]),
-                'month': MonthEnum(int(info[R2][9])),
-                'year': int(info[R2][10])
-            }),
-            'filtration': FiltrationDict({
-                'cycle': FiltrationCycle(int(info[R6][6])),
-                'runtime': FiltrationRuntime(int(info[R6][5])),
-                # 'total-runtime': int(info[R2][16]),
-                # 'requested-runtime': int(info[R2][17])
-            }),
-            'heat_pump': HeatPumpDict({
-                'boost': OffOnState(int(info[R7][24])),
-                'mode': HeatPumpMode(int(info[R7][25]))
-            }),
-            'lock_mode': LockMode(int(info[RG][11])),
-            'power_save': PowerSaveDict({
-                'state': PowerSave(int(info[R6][9])),
-                'peak': StartStopDict({
-                    'start': TimeCodedInteger(int(info[R6][10])),
-                    'stop': TimeCodedInteger(int(info[R6][11]))
-                })
-            }),
-            'sleep': SleepDict({
-                'awake_remaining': int(info[R2][15]),
-                'timer1': SleepTimerDict({
-                    'state': SleepTimer(int(info[R6][12])),
-                    'start': TimeCodedInteger(info[R6][14]),
-                    'stop': TimeCodedInteger(info[R6][16])
-                }),
-                'timer2': SleepTimerDict({
-                    'state': SleepTimer(int(info[R6][13])),
-                    'start': TimeCodedInteger(info[R6][15]),
-                    'stop': TimeCodedInteger(info[R6][17])
-                })
-            }),
-            'time_out': TimeCodedInteger(info[R6][19])
-        })
-
-        self._device = DeviceDict({
-            'model': info[R3][6],
-            'software': info[R3][5]
-        })
-
-        self._lights = LightDict({
-            'brightness': LightBrightness(int(info[R6][1])),
-            'colour': LightColour(int(info[R6][2])),
-            'effect': LightEffect(int(info[R6][4])),
-            'mode': LightMode(int(info[R6][3])),
-            'state': OffOnState(int(info[R5][13]))
-        })
-
-        self._pumps = PumpsDict({
-            'pump1': PumpDict(self._get_pump(info[RG][6], int(info[R5][17]))),
-            'pump2': PumpDict(self._get_pump(info[RG][7], int(info[R5][18]))),
-            'pump3': PumpDict(self._get_pump(info[RG][8], int(info[R5][19]))),
-            'pump4': PumpDict(self._get_pump(info[RG][9], int(info[R5][20]))),
-            'pump5': PumpDict(self._get_pump(info[RG][10], int(info[R5][21])))
-        })
-
-        self._state = StateDict({
-            'auto': OffOnState(int(info[R5][12])),
-            'clean': OffOnState(int(info[R5][15])),
-            'heat': OffOnState(int(info[R5][11])),
-            'label': StateLabel(info[R3][19]),
-            'mode': getattr(OperationMode, info[R4][0]),
-            'sleep': OffOnState(int(info[R5][9])),
-            'uv': OffOnState(int(info[R5][10])),
-            'water': OffOnState(int(info[R2][13]))
-        })
-
-        self._temperature = TemperatureDict({
-            'heater': FloatCodedInteger(info[R2][11]),
-            'target': FloatCodedInteger(info[R6][7]),
-            'water': FloatCodedInteger(info[R5][14])
-        })
-
-        # self._power = {
-        #     'current': int(info[R2][0]),
-        #     'current_limit': int(info[R3][0]),
-        #     'heat_element_current': int(info[R3][21]),
-        #     'voltage': int(info[R2][1])
-        # }
-
-    def _get_pump(self, pump_type: str, value: int) -> dict:
-        _installed = OffOnState.ON if re.match(r'^1-', pump_type) \
-            else OffOnState.OFF
-        _state: Union[
-            OffOnState, OffOnAutoState, OffHighLowState, OffLowAutoState,
-            HighLowState, NoneType
-        ] = None
-        _type: Optional[PumpType] = None
-
-        result = {
-            'installed': _installed,
-            'state': _state,
-            'speed': _type
-        }
-
-        if result['installed'] == OffOnState.OFF:
-            return result
-
-        if re.match(r'.+-1-', pump_type):
-            result['speed'] = PumpType.ONE_SPEED
-        elif re.match(r'.+-2-', pump_type):
-            result['speed'] = PumpType.TWO_SPEED
-        else:
-            result['speed'] = PumpType.UNKNOWN
-
-        if re.match(r'.+01$', pump_type):
-            result['state'] = OffOnState(value)
-        elif re.match(r'.+014$', pump_type):
-            result['state'] = OffOnAutoState(value)
-        elif re.match(r'.+034$', pump_type):
-            result['state'] = OffLowAutoState(value)
-        elif re.match(r'.+023$', pump_type):
-            result['state'] = OffHighLowState(value)
-        elif re.match(r'.+23$', pump_type):
-            result['state'] = HighLowState(value)
-
-        return result
+        self._records = records
+        self._schema = SCHEMAS.select(records)
+
+        if not lazy:
+            self._sections = self._schema.decode(records)
+
+    def _section(self, name: str) -> MyDict:
+        section = self._sections.get(name)
+
+        if section is None:
+            section = self._schema.decode_section(name, self._records)
+            self._sections[name] = section
+
+        return section
+
+    def _same_section(self, other: SpaData, name: str) -> bool:
+        """Return whether a section is undecoded and unchanged in both."""
+        if name in self._sections or name in other._sections:
+            return False
+
+        if self._schema is not other._schema:
+            return False
+
+        return all(
+            self._records.get(record) == other._records.get(record)
+            for record in self._schema.section_records(name)
+        )
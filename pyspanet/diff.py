@@ -0,0 +1,75 @@
+""" pyspanet.diff """
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .data import SpaData
+
+SECTIONS = (
+    'blower',
+    'device',
+    'lights',
+    'power',
+    'pumps',
+    'settings',
+    'state',
+    'temperature',
+)
+
+
+class SpaChange(NamedTuple):
+    """ SpaChange """
+    path: str
+    old: Any
+    new: Any
+
+
+def diff(old: Optional[SpaData], new: SpaData) -> List[SpaChange]:
+    """Return the fields that differ between two snapshots.
+
+    Every field of ``new`` is reported when there is no ``old`` snapshot.
+    """
+    changes: List[SpaChange] = []
+
+    for section in SECTIONS:
+        # pylint: disable=protected-access
+        if old is not None and old._same_section(new, section):
+            continue  # lazy snapshots need not decode unchanged sections
+
+        diff_values(
+            section,
+            None if old is None else getattr(old, section),
+            getattr(new, section),
+            changes
+        )
+
+    return changes
+
+
+def diff_values(
+    path: str,
+    old: Any,
+    new: Any,
+    changes: List[SpaChange]
+) -> None:
+    """Append the changes between two values at path to changes."""
+    if isinstance(new, Mapping) or isinstance(old, Mapping):
+        old = old if isinstance(old, Mapping) else {}
+        new = new if isinstance(new, Mapping) else {}
+
+        for key in new:
+            diff_values(f'{path}.{key}', old.get(key), new[key], changes)
+
+        for key in old:
+            if key not in new:
+                diff_values(f'{path}.{key}', old[key], None, changes)
+
+        return
+
+    if old is new:
+        return
+
+    if type(old) is not type(new) or old != new:
+        changes.append(SpaChange(path, old, new))
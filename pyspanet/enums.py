@@ -1,7 +1,9 @@
 """ pyspanet.enums """
 from __future__ import annotations
 
-from enum import IntEnum, unique
+from enum import Enum, IntEnum, unique
+from typing import Dict, Type
+
 from strenum import StrEnum
 
 
@@ -247,3 +249,67 @@ class StateLabel(StrEnum):
     HEATING = 'Heating'
     IN_USE = 'In use'
     SLEEPING = 'Sleeping'
+
+
+@unique
+class BreakerState(StrEnum):
+    """ BreakerState """
+    CLOSED = 'closed'
+    HALF_OPEN = 'half_open'
+    OPEN = 'open'
+
+
+@unique
+class OverflowPolicy(StrEnum):
+    """ OverflowPolicy """
+    COALESCE = 'coalesce'
+    DROP_OLDEST = 'drop_oldest'
+
+
+###############################################################################
+# Lookup tables
+###############################################################################
+
+EnumTable = Dict[bytes, Enum]
+
+
+def _by_value(enum: Type[Enum]) -> EnumTable:
+    return {str(member.value).encode(): member for member in enum}
+
+
+def _by_name(enum: Type[Enum]) -> EnumTable:
+    return {name.encode(): member for name, member in enum.__members__.items()}
+
+
+# enums decoded from RF frames, library-internal enums are not listed
+ENUMS = (
+    BlowerState,
+    BlowerSpeed,
+    MonthEnum,
+    FiltrationCycle,
+    FiltrationRuntime,
+    HeatPumpMode,
+    LightBrightness,
+    LightColour,
+    LightEffect,
+    LightMode,
+    LockMode,
+    OffOnState,
+    OffOnAutoState,
+    OffLowAutoState,
+    OffHighLowState,
+    HighLowState,
+    OperationMode,
+    PowerSave,
+    PumpType,
+    SleepTimer,
+    StateLabel,
+)
+
+# members keyed by their value and name as they appear in an RF frame
+VALUES: Dict[Type[Enum], EnumTable] = {
+    enum: _by_value(enum) for enum in ENUMS
+}
+NAMES: Dict[Type[Enum], EnumTable] = {
+    enum: _by_name(enum) for enum in ENUMS
+}
@@ -5,5 +5,24 @@ class SpaConnectionError(ConnectionError):
     """Spa connection could not be established."""
 
 
+class SpaCircuitOpenError(SpaConnectionError):
+    """Spa connection failed repeatedly, attempts are suspended."""
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f'circuit open, retry in {retry_after:.1f}s')
+        self.retry_after = retry_after
+
+
+class SpaTimeoutError(SpaConnectionError, TimeoutError):
+    """Spa did not answer in time."""
+
+
 class SpaMessageError(Exception):
     """Spa message is invalid."""
+
+
+class SpaDecodeError(SpaMessageError, ValueError):
+    """Spa message contains a value that cannot be decoded."""
+    def __init__(self, enum: type, value: bytes) -> None:
+        super().__init__(f'{value!r} is not a valid {enum.__name__}')
+        self.enum = enum
+        self.value = value
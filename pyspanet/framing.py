@@ -0,0 +1,98 @@
+""" pyspanet.framing """
+from __future__ import annotations
+
+from typing import Optional, Union
+
+from .exceptions import SpaMessageError
+from .parser import MAX_FRAME_SIZE, RFParser
+
+REFRESH_PREFIX = b'RF'
+WHITESPACE = b' \r\n'
+
+SpaFrame = Union[bytes, RFParser]
+
+
+class SpaFrameReader():
+    """ SpaFrameReader
+
+    Accumulates bytes read from the spa until a complete response is seen.
+    An ``RF`` response is handed to an RFParser as it arrives and is
+    complete once its ``RG`` record has been terminated, any other
+    response (``-OK`` ack, echoed command or integer value) once a line
+    has been terminated.
+    """
+    def __init__(self, max_size: int = MAX_FRAME_SIZE) -> None:
+        self._buffer = bytearray()
+        self._parser: Optional[RFParser] = None
+        self._max_size = max_size
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def clear(self) -> None:
+        """Discard any buffered bytes."""
+        self._buffer.clear()
+        self._parser = None
+
+    def feed(self, data: bytes) -> None:
+        """Append bytes read from the spa to the buffer."""
+        if self._parser is not None:
+            try:
+                self._parser.feed(data)
+            except SpaMessageError:
+                self.clear()
+                raise
+            return
+
+        self._buffer += data
+
+        if len(self._buffer) > self._max_size:
+            self.clear()
+            raise SpaMessageError(
+                f'response exceeds {self._max_size} bytes'
+            )
+
+    def frame(self) -> Optional[SpaFrame]:
+        """Remove and return the next complete frame, if any.
+
+        An ``RF`` response is returned as its RFParser, anything else as
+        the bytes of the line.
+        """
+        if self._parser is None:
+            buffer = self._buffer
+            start = 0
+
+            while start < len(buffer) and buffer[start] in WHITESPACE:
+                start += 1
+
+            if start:
+                del buffer[:start]
+
+            if REFRESH_PREFIX.startswith(buffer):
+                return None  # empty, or too short to tell
+
+            if not buffer.startswith(REFRESH_PREFIX):
+                end = buffer.find(b'\n')
+
+                if end == -1:
+                    return None
+
+                frame = bytes(buffer[:end])
+                del buffer[:end]
+
+                return frame
+
+            self._parser = RFParser(self._max_size)
+            data = bytes(buffer)
+            buffer.clear()
+            self.feed(data)
+
+        parser = self._parser
+
+        if not parser.done:
+            return None
+
+        self._parser = None
+        self._buffer += parser.remainder
+
+        return parser
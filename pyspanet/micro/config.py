@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from ..config import SpaConfig
+from ..config import SpaConfig, options
 
 
 @dataclass
@@ -11,6 +11,8 @@ class SpaMicroConfig(SpaConfig):
     """ SpaMicroConfig """
     def __init__(self, config: dict) -> None:
         """ initialise """
+        super().__init__(**options(config))
+
         self._baudrate: int
         self._uart_id: int
 
@@ -1,6 +1,7 @@
 """ SpaMicroConnection class """
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 
@@ -9,16 +10,24 @@ from typing import Any
 import machine
 
 from ..connection import SpaConnection
+from ..exceptions import SpaMessageError, SpaTimeoutError
+from ..framing import SpaFrame, SpaFrameReader
 from .config import SpaMicroConfig
 
+# seconds between checks of the UART for the answer
+POLL_INTERVAL = 0.01
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class SpaMicroConnection(SpaConnection):
     """ SpaMicroConnection """
     def __init__(self, config: SpaMicroConfig) -> None:
+        super().__init__(config.heartbeat_interval, config.reconnect)
+
         self._config = config
         self._uart: machine.UART
+        self._frames = SpaFrameReader()
 
     @property
     def _connected(self) -> bool:
@@ -56,13 +65,29 @@ class SpaMicroConnection(SpaConnection):
         self._uart = None
         _LOGGER.debug("UART %s -- disconnected", self._config.uart_id)
 
-    async def _send(self, msg: str) -> Any:
+    async def _send(self, msg: str, deadline: float) -> Any:
+        self._frames.clear()
         self._uart.write(f'{msg}\n')
 
-        while not self._uart.any():
-            time.sleep(0.1)
+        frame = None
+
+        try:
+            while frame is None:
+                if time.monotonic() >= deadline:
+                    # drop whatever part of the answer arrives late
+                    self._frames.clear()
+                    raise SpaTimeoutError(f'no answer to {msg}')
+
+                if not self._uart.any():
+                    await asyncio.sleep(POLL_INTERVAL)
+                    continue
+
+                self._frames.feed(self._uart.read())
+                frame = self._frames.frame()
 
-        time.sleep(1)
-        result = self._uart.read()
+                # a steady trickle of bytes must not starve the loop
+                await asyncio.sleep(0)
+        except SpaMessageError:
+            return None
 
-        return result.decode('utf-8')
+        return frame
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from ..config import SpaConfig
+from ..config import SpaConfig, options
 
 DEFAULT_PORT = 9090
 
@@ -11,6 +11,8 @@ DEFAULT_PORT = 9090
 class SpaNetConfig(SpaConfig):
     """SpaNet config"""
     def __init__(self, config: dict) -> None:
+        super().__init__(**options(config))
+
         self._host: str
         self._port: int
         self._mac_address: str
@@ -82,4 +84,4 @@ class SpaNetConfig(SpaConfig):
     @property
     def port(self) -> int:
         """ port: int """
-        return self._port | DEFAULT_PORT
+        return self._port or DEFAULT_PORT
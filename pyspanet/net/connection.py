@@ -1,42 +1,44 @@
 """ SpaNetConnection class """
 from __future__ import annotations
 
+import asyncio
 import logging
 import socket
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from .config import SpaNetConfig
-from ..connection import SpaConnection
+from ..connection import SpaConnection, remaining
+from ..exceptions import SpaMessageError, SpaTimeoutError
+from ..framing import SpaFrame, SpaFrameReader
 
 CONNECT_SUCCESS = 'Successfully connected'
 
+# seconds idle before the first keepalive probe, seconds between probes
+# and unanswered probes before the link is dropped
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class SpaNetConnection(SpaConnection):
     """ SpaNetConnection """
     def __init__(self, config: SpaNetConfig) -> None:
+        super().__init__(config.heartbeat_interval, config.reconnect)
+
         self._config = config
-        self._socket: socket.socket
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._frames = SpaFrameReader()
 
     @property
     def _connected(self) -> bool:
-        try:
-            # read bytes without blocking and or removing them from buffer
-            data = self._socket.recv(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)
-
-            if len(data) == 0:
-                return False
-        except AttributeError:
+        if self._writer is None or self._reader is None:
             return False
-        except BlockingIOError:
-            return True  # socket is open and reading from it would block
-        except ConnectionResetError:
-            return False  # socket was closed for some other reason
-        except Exception:
-            return True
-        return True
+
+        return not (self._writer.is_closing() or self._reader.at_eof())
 
     async def _connect(self) -> bool:
         """Connect to the spa."""
@@ -46,36 +48,138 @@ class SpaNetConnection(SpaConnection):
 
         _LOGGER.debug("%s -- establishing connection", self._config.host)
 
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
         try:
-            self._socket.connect((self._config.host, self._config.port))
-            self._socket.send(bytes(self._config.connect_string, 'utf-8'))
-            data = self._socket.recv(22)
+            self._reader, self._writer = await asyncio.open_connection(
+                self._config.host,
+                self._config.port
+            )
+
+            if self._config.keepalive:
+                self._keepalive(self._writer)
+
+            self._writer.write(bytes(self._config.connect_string, 'utf-8'))
+            await self._writer.drain()
+            data = await self._reader.readexactly(len(CONNECT_SUCCESS))
         except Exception:
+            await self._close()
             return False
 
         if data.decode() == CONNECT_SUCCESS:
             return True
 
+        await self._close()
         return False
 
     async def _disconnect(self) -> None:
         """Disconnect from the spa."""
         _LOGGER.debug("%s -- disconnect requested", self._config.host)
 
-        if self.connected:
-            self._socket.shutdown(socket.SHUT_RDWR)
-            self._socket.close()
+        await self._close()
 
         _LOGGER.debug("%s -- disconnected", self._config.host)
 
-    async def _send(self, msg: str) -> Optional[str]:
+    async def _send(self, msg: str, deadline: float) -> Optional[SpaFrame]:
+        return (await self._send_many((msg,), deadline))[0]
+
+    async def _send_many(
+        self,
+        msgs: Tuple[str, ...],
+        deadline: float
+    ) -> List[Optional[SpaFrame]]:
+        """Write every message at once, then read the answers in order."""
         if not self.connected:
-            if not await self._connect():
+            return [None] * len(msgs)
+
+        assert self._reader is not None and self._writer is not None
+
+        # anything still buffered is stale, the spa only talks when asked
+        self._frames.clear()
+
+        try:
+            return await asyncio.wait_for(
+                self._exchange(msgs), remaining(deadline)
+            )
+        except asyncio.TimeoutError:
+            # a late answer would be taken as the reply to the next command
+            await self._close()
+            raise SpaTimeoutError(f'no answer to {", ".join(msgs)}') from None
+        except (ConnectionError, OSError, SpaMessageError):
+            await self._close()
+            return [None] * len(msgs)
+
+    async def _exchange(
+        self,
+        msgs: Tuple[str, ...]
+    ) -> List[Optional[SpaFrame]]:
+        assert self._writer is not None
+
+        self._writer.write(
+            b''.join(bytes(f'{msg}\n', 'utf-8') for msg in msgs)
+        )
+        await self._writer.drain()
+
+        results: List[Optional[SpaFrame]] = []
+
+        for _ in msgs:
+            frame = await self._read_frame()
+            results.append(frame)
+
+            if frame is None:
+                break
+
+        return results + [None] * (len(msgs) - len(results))
+
+    async def _read_frame(self) -> Optional[SpaFrame]:
+        assert self._reader is not None
+
+        frame = self._frames.frame()
+
+        while frame is None:
+            data = await self._reader.read(1024)
+
+            if not data:
+                await self._close()
                 return None
 
-        self._socket.sendall(bytes(f'{msg}\n', 'utf-8'))
-        result = self._socket.recv(1024)
+            self._frames.feed(data)
+            frame = self._frames.frame()
+
+        return frame
 
-        return str(result.decode('utf-8'))
+    @staticmethod
+    def _keepalive(writer: asyncio.StreamWriter) -> None:
+        """Let the OS detect a dead link while the connection is idle."""
+        sock = writer.get_extra_info('socket')
+
+        if sock is None:
+            return
+
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        # not every platform exposes the tuning options
+        for option, value in (
+            ('TCP_KEEPIDLE', KEEPALIVE_IDLE),
+            ('TCP_KEEPINTVL', KEEPALIVE_INTERVAL),
+            ('TCP_KEEPCNT', KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(
+                    socket.IPPROTO_TCP, getattr(socket, option), value
+                )
+
+    async def _close(self) -> None:
+        writer = self._writer
+
+        self._reader = None
+        self._writer = None
+        self._frames.clear()
+
+        if writer is None:
+            return
+
+        writer.close()
+
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
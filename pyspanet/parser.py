@@ -0,0 +1,122 @@
+""" RFParser class """
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .exceptions import SpaMessageError
+from .schema import RG, Records
+
+if TYPE_CHECKING:
+    from .data import SpaData
+
+MAX_FRAME_SIZE = 4096
+
+
+class RFParser():
+    """ RFParser
+
+    Incremental parser for ``RF`` responses. Chunks are fed in as they
+    are read from the socket or UART and every record is split as soon as
+    its terminator is seen, so parsing overlaps the read and the whole
+    response is never held as one string. Bytes received after the ``RG``
+    record are kept in ``remainder``.
+    """
+    def __init__(self, max_size: int = MAX_FRAME_SIZE) -> None:
+        self._records: Records = {}
+        self._partial = b''
+        self._remainder = b''
+        self._size = 0
+        self._max_size = max_size
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Return whether the RG record has been received."""
+        return self._done
+
+    @property
+    def remainder(self) -> bytes:
+        """Return the bytes received after the end of the response."""
+        return self._remainder
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk, returning whether the response is complete."""
+        if self._done:
+            self._remainder += chunk
+            return True
+
+        self._size += len(chunk)
+
+        if self._size > self._max_size:
+            raise SpaMessageError(
+                f'response exceeds {self._max_size} bytes'
+            )
+
+        data = self._partial + chunk if self._partial else chunk
+        start = 0
+
+        while True:
+            newline = data.find(b'\n', start)
+            limit = len(data) if newline == -1 else newline
+
+            # a terminated record need not wait for its line end
+            stop = data.find(b':*', start, limit)
+
+            if stop != -1:
+                end = following = stop + 2
+            elif newline != -1:
+                end, following = newline, newline + 1
+            else:
+                break
+
+            if self._record(data[start:end]):
+                return self._finish(data[following:])
+
+            start = following
+
+        tail = data[start:]
+
+        if tail.rstrip(b'\r').endswith(b',:'):
+            if self._record(tail):
+                return self._finish(b'')
+
+            tail = b''
+
+        self._partial = tail
+
+        return False
+
+    def records(self) -> Records:
+        """Return the records received so far, keyed by record name."""
+        return self._records
+
+    def result(self, lazy: bool = False) -> SpaData:
+        """Return the data of a complete response."""
+        from .data import SpaData  # pylint: disable=import-outside-toplevel
+
+        if not self._done:
+            raise SpaMessageError('incomplete response')
+
+        return SpaData(self, lazy=lazy)
+
+    def _finish(self, remainder: bytes) -> bool:
+        self._partial = b''
+        self._remainder = remainder.lstrip(b'\r\n')
+
+        return True
+
+    def _record(self, line: bytes) -> bool:
+        """Store a record, returning whether it ends the response."""
+        line = line.strip(b' ,:*\r')
+
+        if not line:
+            return False
+
+        items = line.split(b',')
+        name = items[0].decode()
+        self._records[name] = items
+
+        if name == RG:
+            self._done = True
+
+        return self._done
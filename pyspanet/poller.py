@@ -0,0 +1,161 @@
+""" SpaPoller class """
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from .enums import OffOnState
+
+if TYPE_CHECKING:
+    from .client import SpaClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SpaPollerConfig():
+    """ SpaPollerConfig
+
+    While the spa is active (heating, cleaning, or within ``active_hold``
+    seconds of a command) it is polled every ``active_interval`` seconds.
+    Once idle the interval starts at ``idle_interval`` and is multiplied
+    by ``backoff`` after every poll, up to ``max_interval``. Each interval
+    is randomised by +/- ``jitter`` (a fraction) so a fleet of spas does
+    not poll in lock step.
+    """
+    active_interval: float = 2.0
+    idle_interval: float = 10.0
+    max_interval: float = 300.0
+    backoff: float = 2.0
+    jitter: float = 0.1
+    active_hold: float = 60.0
+
+
+class SpaPoller():
+    """ SpaPoller """
+    def __init__(
+        self,
+        client: SpaClient,
+        config: Optional[SpaPollerConfig] = None
+    ) -> None:
+        self._client = client
+        self._config = config or SpaPollerConfig()
+        self._interval = self._config.active_interval
+        self._last_activity = time.monotonic()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def config(self) -> SpaPollerConfig:
+        """ config: SpaPollerConfig """
+        return self._config
+
+    @property
+    def interval(self) -> float:
+        """Return the current interval between polls, before jitter."""
+        return self._interval
+
+    @property
+    def running(self) -> bool:
+        """ running: bool """
+        return self._task is not None and not self._task.done()
+
+    @property
+    def active(self) -> bool:
+        """Return whether the spa is currently considered active."""
+        if time.monotonic() - self._last_activity < self._config.active_hold:
+            return True
+
+        data = getattr(self._client, '_data', None)
+
+        if data is None:
+            return False
+
+        return OffOnState.ON in (data.heating, data.cleaning)
+
+    def kick(self) -> None:
+        """Record activity and bring the next poll forward."""
+        self._last_activity = time.monotonic()
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self.running:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        task = self._task
+        self._task = None
+
+        if task is None or task.done():
+            return
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _next_interval(self, success: bool) -> float:
+        config = self._config
+
+        if success and self.active:
+            self._interval = config.active_interval
+        elif self._interval < config.idle_interval:
+            self._interval = config.idle_interval
+        else:
+            self._interval = min(
+                self._interval * config.backoff,
+                config.max_interval
+            )
+
+        return self._interval * random.uniform(
+            1 - config.jitter,
+            1 + config.jitter
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                success = await self._client.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                _LOGGER.debug("poll failed: %s", error)
+                success = False
+
+            await self._sleep(self._next_interval(success))
+
+    async def _sleep(self, interval: float) -> None:
+        assert self._wakeup is not None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + interval
+
+        while True:
+            remaining = deadline - loop.time()
+
+            if remaining <= 0:
+                return
+
+            self._wakeup.clear()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+            # activity: poll again soon rather than after a long idle wait
+            self._interval = self._config.active_interval
+            deadline = min(deadline, loop.time() + self._interval)
@@ -0,0 +1,107 @@
+""" pyspanet.profile """
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple, Type, Union
+
+from .enums import (
+    HighLowState,
+    OffHighLowState,
+    OffLowAutoState,
+    OffOnAutoState,
+    OffOnState,
+    PumpType,
+)
+
+PUMPS = ('pump1', 'pump2', 'pump3', 'pump4', 'pump5')
+
+PumpStates = Union[
+    Type[OffOnState],
+    Type[OffOnAutoState],
+    Type[OffLowAutoState],
+    Type[OffHighLowState],
+    Type[HighLowState],
+]
+
+_INSTALLED = re.compile(rb'^1-')
+
+# checked in order, the first match wins
+_SPEEDS = (
+    (re.compile(rb'.+-1-'), PumpType.ONE_SPEED),
+    (re.compile(rb'.+-2-'), PumpType.TWO_SPEED),
+)
+
+_STATES: Tuple[Tuple[re.Pattern[bytes], PumpStates], ...] = (
+    (re.compile(rb'.+01$'), OffOnState),
+    (re.compile(rb'.+014$'), OffOnAutoState),
+    (re.compile(rb'.+034$'), OffLowAutoState),
+    (re.compile(rb'.+023$'), OffHighLowState),
+    (re.compile(rb'.+23$'), HighLowState),
+)
+
+
+class PumpProfile(NamedTuple):
+    """ PumpProfile
+
+    What a pump supports, from its ``RG`` type descriptor, e.g.
+    ``1-1-014``: installed, one speed, off/on/auto.
+    """
+    installed: OffOnState
+    speed: Optional[PumpType]
+    states: Optional[PumpStates]
+
+
+class SpaProfile(NamedTuple):
+    """ SpaProfile
+
+    Capabilities of a spa, which do not change between refreshes. Profiles
+    are cached and shared, so ``pumps`` is read-only.
+    """
+    model: str
+    software: str
+    pumps: Mapping[str, PumpProfile]
+
+    @property
+    def installed(self) -> Tuple[str, ...]:
+        """ installed: Tuple[str, ...] """
+        return tuple(
+            name for name, pump in self.pumps.items()
+            if pump.installed == OffOnState.ON
+        )
+
+
+@lru_cache(maxsize=None)
+def pump_profile(descriptor: bytes) -> PumpProfile:
+    """Return the profile of a pump from its RG type descriptor."""
+    if not _INSTALLED.match(descriptor):
+        return PumpProfile(OffOnState.OFF, None, None)
+
+    speed = next(
+        (speed for pattern, speed in _SPEEDS if pattern.match(descriptor)),
+        PumpType.UNKNOWN
+    )
+    states = next(
+        (enum for pattern, enum in _STATES if pattern.match(descriptor)),
+        None
+    )
+
+    return PumpProfile(OffOnState.ON, speed, states)
+
+
+@lru_cache(maxsize=None)
+def spa_profile(
+    model: bytes,
+    software: bytes,
+    descriptors: Tuple[bytes, ...]
+) -> SpaProfile:
+    """Return the profile of a spa from its R3 and RG record values."""
+    return SpaProfile(
+        model.decode(),
+        software.decode(),
+        MappingProxyType({
+            name: pump_profile(descriptor)
+            for name, descriptor in zip(PUMPS, descriptors)
+        })
+    )
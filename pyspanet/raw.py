@@ -0,0 +1,91 @@
+""" SpaRaw class """
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Iterator
+
+from .schema import R2, SCHEMA, Records, Source, SpaSchema
+
+# array('i') holds a C int, the smallest one marks values that are not
+# integers or do not fit
+INVALID = -2 ** 31
+_INT_MAX = 2 ** 31 - 1
+
+# names of record values the schema does not decode, the electrical and
+# heater telemetry it does decode is found by field path
+RAW_FIELDS: Dict[str, Source] = {
+    'settings.filtration.requested_runtime': (R2, 17),
+    'settings.filtration.total_runtime': (R2, 16),
+}
+
+
+def register(name: str, record: str, index: int) -> None:
+    """Name a record value that is not decoded by the schema."""
+    RAW_FIELDS[name] = (record, index)
+
+
+@lru_cache(maxsize=None)
+def schema_fields(schema: SpaSchema) -> Dict[str, Source]:
+    """Return the single value fields of a layout by name.
+
+    e.g. ``'power.voltage' -> ('R2', 1)``
+    """
+    return {
+        spec.path: spec.sources[0]
+        for spec in schema.fields
+        if len(spec.sources) == 1
+    }
+
+
+def _integer(value: bytes) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        return INVALID
+
+    return number if INVALID < number <= _INT_MAX else INVALID
+
+
+class SpaRaw(Mapping):
+    """ SpaRaw
+
+    Every value of an RF frame as an ``array('i')`` per record, indexed
+    like the schema (the record name is not included). Values that are
+    not integers, such as the model or software version, or that do not
+    fit a C int read as INVALID.
+    Arrays are built the first time a record is accessed.
+    """
+    def __init__(
+        self,
+        records: Records,
+        schema: SpaSchema = SCHEMA
+    ) -> None:
+        self._records = records
+        self._fields = schema_fields(schema)
+        self._arrays: Dict[str, array] = {}
+
+    def __getitem__(self, record: str) -> array:
+        values = self._arrays.get(record)
+
+        if values is None:
+            values = array('i', [
+                _integer(value) for value in self._records[record][1:]
+            ])
+            self._arrays[record] = values
+
+        return values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def value(self, name: str) -> int:
+        """Return a value by field path or by a name in RAW_FIELDS."""
+        source = RAW_FIELDS.get(name)
+        record, index = self._fields[name] if source is None else source
+
+        return int(self[record][index])
@@ -0,0 +1,116 @@
+""" SpaReconnectPolicy class """
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .enums import BreakerState
+
+
+@dataclass
+class SpaReconnectConfig():
+    """ SpaReconnectConfig
+
+    After the nth consecutive failure the next attempt waits a random
+    delay between 0 and ``base_delay * 2 ** (n - 1)``, capped at
+    ``max_delay`` (full jitter), so a fleet that lost the relay at once
+    does not reconnect in step.
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    callers fail fast for ``reset_timeout`` seconds, after which a single
+    trial attempt is let through.
+    """
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class SpaReconnectPolicy():
+    """ SpaReconnectPolicy """
+    def __init__(self, config: Optional[SpaReconnectConfig] = None) -> None:
+        self._config = config or SpaReconnectConfig()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._next_attempt = 0.0
+        self._trial = False
+
+    @property
+    def config(self) -> SpaReconnectConfig:
+        """ config: SpaReconnectConfig """
+        return self._config
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds until the next attempt is allowed."""
+        if self.state == BreakerState.OPEN:
+            wait = self._opened_at + self._config.reset_timeout
+        else:
+            wait = self._next_attempt
+
+        return max(wait - time.monotonic(), 0.0)
+
+    @property
+    def state(self) -> BreakerState:
+        """ state: BreakerState """
+        if self._state == BreakerState.OPEN and self._reset_due():
+            return BreakerState.HALF_OPEN
+
+        return self._state
+
+    def allow(self) -> bool:
+        """Return whether an attempt may be made now."""
+        if self._state == BreakerState.OPEN:
+            if not self._reset_due():
+                return False
+
+            self._state = BreakerState.HALF_OPEN
+            self._trial = False
+
+        if self._state == BreakerState.HALF_OPEN:
+            if self._trial:
+                return False  # a trial attempt is already under way
+
+            self._trial = True
+            return True
+
+        return time.monotonic() >= self._next_attempt
+
+    def success(self) -> None:
+        """Record a successful attempt, closing the breaker."""
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._next_attempt = 0.0
+        self._trial = False
+
+    def failure(self) -> None:
+        """Record a failed attempt."""
+        config = self._config
+        now = time.monotonic()
+
+        self._failures += 1
+        self._trial = False
+
+        if self._state == BreakerState.HALF_OPEN or (
+            self._state == BreakerState.CLOSED and
+            self._failures >= config.failure_threshold
+        ):
+            self._state = BreakerState.OPEN
+            self._opened_at = now
+
+        ceiling = min(
+            config.base_delay * 2 ** (self._failures - 1),
+            config.max_delay
+        )
+        self._next_attempt = now + random.uniform(0, ceiling)
+
+    def _reset_due(self) -> bool:
+        return time.monotonic() >= \
+            self._opened_at + self._config.reset_timeout
@@ -0,0 +1,630 @@
+""" pyspanet.schema """
+from __future__ import annotations
+
+import logging
+from builtins import type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .collections import (
+    BlowerDict,
+    DateTimeDict,
+    DeviceDict,
+    FiltrationDict,
+    FloatCodedInteger,
+    HeatPumpDict,
+    LightDict,
+    MyDict,
+    PowerDict,
+    PowerSaveDict,
+    PumpDict,
+    PumpsDict,
+    SettingDict,
+    SleepDict,
+    SleepTimerDict,
+    StartStopDict,
+    StateDict,
+    TemperatureDict,
+    TimeCodedInteger,
+)
+from .enums import (
+    NAMES,
+    VALUES,
+    BlowerSpeed,
+    BlowerState,
+    FiltrationCycle,
+    FiltrationRuntime,
+    HeatPumpMode,
+    HighLowState,
+    LightBrightness,
+    LightColour,
+    LightEffect,
+    LightMode,
+    LockMode,
+    MonthEnum,
+    OffHighLowState,
+    OffLowAutoState,
+    OffOnAutoState,
+    OffOnState,
+    OperationMode,
+    PowerSave,
+    SleepTimer,
+    StateLabel,
+)
+from .exceptions import SpaDecodeError, SpaMessageError
+from .profile import PUMPS, SpaProfile, pump_profile, spa_profile
+
+R2 = 'R2'
+R3 = 'R3'
+R4 = 'R4'
+R5 = 'R5'
+R6 = 'R6'
+R7 = 'R7'
+R9 = 'R9'
+RA = 'RA'
+RB = 'RB'
+RC = 'RC'
+RE = 'RE'
+RG = 'RG'
+
+_LOGGER = logging.getLogger(__name__)
+
+NoneType = type(None)
+
+Records = Dict[str, List[bytes]]
+Source = Tuple[str, int]
+LeafPlan = Tuple[int, str, int, Callable[..., Any]]
+CompositePlan = Tuple[int, Tuple[Source, ...], Callable[..., Any]]
+ContainerPlan = Tuple[Type[MyDict], Tuple[Tuple[str, bool, int], ...]]
+
+
+class SpaField(NamedTuple):
+    """ SpaField """
+    path: str
+    sources: Tuple[Source, ...]
+    decoder: Callable[..., Any]
+
+
+def field(
+    path: str,
+    record: str,
+    index: int,
+    decoder: Callable[..., Any]
+) -> SpaField:
+    """Describe a field decoded from a single record value."""
+    return SpaField(path, ((record, index),), decoder)
+
+
+###############################################################################
+# Decoders
+###############################################################################
+
+def decode_enum(enum: Type[Any]) -> Callable[[bytes], Any]:
+    """Decode an integer valued enum."""
+    table = VALUES[enum]
+
+    def decode(value: bytes) -> Any:
+        member = table.get(value)
+
+        if member is None:
+            # not in canonical form, e.g. b'04'
+            try:
+                member = table.get(str(int(value)).encode())
+            except ValueError:
+                pass
+
+            if member is None:
+                raise SpaDecodeError(enum, value)
+
+        return member
+
+    return decode
+
+
+def decode_str_enum(enum: Type[Any]) -> Callable[[bytes], Any]:
+    """Decode a string valued enum."""
+    return _decode_table(enum, VALUES[enum])
+
+
+def decode_member(enum: Type[Any]) -> Callable[[bytes], Any]:
+    """Decode an enum by member name."""
+    return _decode_table(enum, NAMES[enum])
+
+
+def _decode_table(
+    enum: Type[Any],
+    table: Dict[bytes, Any]
+) -> Callable[[bytes], Any]:
+    def decode(value: bytes) -> Any:
+        member = table.get(value)
+
+        if member is None:
+            raise SpaDecodeError(enum, value)
+
+        return member
+
+    return decode
+
+
+def decode_text(value: bytes) -> str:
+    """Decode a textual field."""
+    return value.decode()
+
+
+_PUMP_STATES = {
+    enum: decode_enum(enum)
+    for enum in (
+        OffOnState,
+        OffOnAutoState,
+        OffLowAutoState,
+        OffHighLowState,
+        HighLowState,
+    )
+}
+
+
+def decode_pump(pump_type: bytes, value: bytes) -> PumpDict:
+    """Decode a pump from its RG type descriptor and R5 state."""
+    profile = pump_profile(pump_type)
+    state: Union[
+        OffOnState, OffOnAutoState, OffHighLowState, OffLowAutoState,
+        HighLowState, NoneType
+    ] = None
+
+    if profile.states is not None:
+        try:
+            state = _PUMP_STATES[profile.states](value)
+        except SpaDecodeError as error:
+            _LOGGER.warning('unable to decode pump state: %s', error)
+
+    return PumpDict.wrap({
+        'installed': profile.installed,
+        'state': state,
+        'speed': profile.speed
+    })
+
+
+###############################################################################
+# Layout
+###############################################################################
+
+CONTAINERS: Dict[str, Type[MyDict]] = {
+    'blower': BlowerDict,
+    'device': DeviceDict,
+    'lights': LightDict,
+    'power': PowerDict,
+    'pumps': PumpsDict,
+    'settings': SettingDict,
+    'settings.datetime': DateTimeDict,
+    'settings.filtration': FiltrationDict,
+    'settings.heat_pump': HeatPumpDict,
+    'settings.power_save': PowerSaveDict,
+    'settings.power_save.peak': StartStopDict,
+    'settings.sleep': SleepDict,
+    'settings.sleep.timer1': SleepTimerDict,
+    'settings.sleep.timer2': SleepTimerDict,
+    'state': StateDict,
+    'temperature': TemperatureDict,
+}
+
+FIELDS: Tuple[SpaField, ...] = (
+    field('blower.speed', R6, 0, decode_enum(BlowerSpeed)),
+    field('blower.state', RC, 9, decode_enum(BlowerState)),
+
+    field('device.model', R3, 6, decode_text),
+    field('device.software', R3, 5, decode_text),
+
+    field('lights.brightness', R6, 1, decode_enum(LightBrightness)),
+    field('lights.colour', R6, 2, decode_enum(LightColour)),
+    field('lights.effect', R6, 4, decode_enum(LightEffect)),
+    field('lights.mode', R6, 3, decode_enum(LightMode)),
+    field('lights.state', R5, 13, decode_enum(OffOnState)),
+
+    field('power.current', R2, 0, int),
+    field('power.current_limit', R3, 0, int),
+    field('power.heat_element_current', R3, 21, int),
+    field('power.voltage', R2, 1, int),
+
+    SpaField('pumps.pump1', ((RG, 6), (R5, 17)), decode_pump),
+    SpaField('pumps.pump2', ((RG, 7), (R5, 18)), decode_pump),
+    SpaField('pumps.pump3', ((RG, 8), (R5, 19)), decode_pump),
+    SpaField('pumps.pump4', ((RG, 9), (R5, 20)), decode_pump),
+    SpaField('pumps.pump5', ((RG, 10), (R5, 21)), decode_pump),
+
+    field('settings.auto_clean', R7, 0, TimeCodedInteger),
+    field('settings.datetime.hours', R2, 5, int),
+    field('settings.datetime.minutes', R2, 6, int),
+    field('settings.datetime.seconds', R2, 7, int),
+    field('settings.datetime.day', R2, 8, int),
+    field('settings.datetime.month', R2, 9, decode_enum(MonthEnum)),
+    field('settings.datetime.year', R2, 10, int),
+    field('settings.filtration.cycle', R6, 6, decode_enum(FiltrationCycle)),
+    field(
+        'settings.filtration.runtime', R6, 5,
+        decode_enum(FiltrationRuntime)
+    ),
+    field('settings.heat_pump.boost', R7, 24, decode_enum(OffOnState)),
+    field('settings.heat_pump.mode', R7, 25, decode_enum(HeatPumpMode)),
+    field('settings.lock_mode', RG, 11, decode_enum(LockMode)),
+    field('settings.power_save.state', R6, 9, decode_enum(PowerSave)),
+    field('settings.power_save.peak.start', R6, 10, TimeCodedInteger),
+    field('settings.power_save.peak.stop', R6, 11, TimeCodedInteger),
+    field('settings.sleep.awake_remaining', R2, 15, int),
+    field('settings.sleep.timer1.state', R6, 12, decode_enum(SleepTimer)),
+    field('settings.sleep.timer1.start', R6, 14, TimeCodedInteger),
+    field('settings.sleep.timer1.stop', R6, 16, TimeCodedInteger),
+    field('settings.sleep.timer2.state', R6, 13, decode_enum(SleepTimer)),
+    field('settings.sleep.timer2.start', R6, 15, TimeCodedInteger),
+    field('settings.sleep.timer2.stop', R6, 17, TimeCodedInteger),
+    field('settings.time_out', R6, 19, TimeCodedInteger),
+
+    field('state.auto', R5, 12, decode_enum(OffOnState)),
+    field('state.clean', R5, 15, decode_enum(OffOnState)),
+    field('state.heat', R5, 11, decode_enum(OffOnState)),
+    field('state.label', R3, 19, decode_str_enum(StateLabel)),
+    field('state.mode', R4, 0, decode_member(OperationMode)),
+    field('state.sleep', R5, 9, decode_enum(OffOnState)),
+    field('state.uv', R5, 10, decode_enum(OffOnState)),
+    field('state.water', R2, 13, decode_enum(OffOnState)),
+
+    field('temperature.heater', R2, 11, FloatCodedInteger),
+    field('temperature.target', R6, 7, FloatCodedInteger),
+    field('temperature.water', R5, 14, FloatCodedInteger),
+)
+
+
+###############################################################################
+# Compiled plan
+###############################################################################
+
+class SectionPlan(NamedTuple):
+    """ SectionPlan
+
+    ``leaves`` decode one record value each into the flat ``values`` list
+    and ``composites`` decode several. ``containers`` are then built
+    children first; each lists its keys with either the slot of a decoded
+    value or, when ``nested`` is set, of a container built before it.
+    """
+    paths: Tuple[str, ...]
+    records: FrozenSet[str]
+    leaves: Tuple[LeafPlan, ...]
+    composites: Tuple[CompositePlan, ...]
+    containers: Tuple[ContainerPlan, ...]
+
+
+class SpaSchema():
+    """ SpaSchema
+
+    Field layout of an RF frame, compiled once into a plan per top level
+    section (``blower``, ``settings``, ...).
+    """
+    def __init__(
+        self,
+        fields: Iterable[SpaField],
+        containers: Dict[str, Type[MyDict]]
+    ) -> None:
+        self._fields = tuple(fields)
+        self._containers = containers
+        self._plans = self._compile(self._fields, containers)
+
+        # records keep their name at index 0
+        self._by_path: Dict[str, SpaField] = {
+            spec.path: spec._replace(sources=tuple(
+                (record, index + 1) for record, index in spec.sources
+            ))
+            for spec in self._fields
+        }
+        self._by_record: Dict[str, List[SpaField]] = {}
+
+        for spec in self._by_path.values():
+            for record, _ in spec.sources:
+                self._by_record.setdefault(record, []).append(spec)
+
+    @property
+    def fields(self) -> Tuple[SpaField, ...]:
+        """ fields: Tuple[SpaField, ...] """
+        return self._fields
+
+    @property
+    def sections(self) -> Tuple[str, ...]:
+        """ sections: Tuple[str, ...] """
+        return tuple(self._plans)
+
+    def profile(self, records: Records) -> SpaProfile:
+        """Return the capability profile of the spa that sent records."""
+        def first(path: str) -> bytes:
+            spec = self._by_path.get(path)
+            values = None if spec is None else self.raw(spec, records)
+
+            return values[0] if values else b''
+
+        return spa_profile(
+            first('device.model'),
+            first('device.software'),
+            tuple(first(f'pumps.{name}') for name in PUMPS)
+        )
+
+    def lookup(self, path: str) -> Optional[SpaField]:
+        """Return the field at path, or the field containing it."""
+        while path:
+            spec = self._by_path.get(path)
+
+            if spec is not None:
+                return spec
+
+            path = path.rpartition('.')[0]
+
+        return None
+
+    def changed(self, old: Records, new: Records) -> List[SpaField]:
+        """Return the fields whose record values differ."""
+        result: Dict[str, SpaField] = {}
+
+        for record, specs in self._by_record.items():
+            if old.get(record) == new.get(record):
+                continue
+
+            for spec in specs:
+                if spec.path not in result and \
+                        self.raw(spec, old) != self.raw(spec, new):
+                    result[spec.path] = spec
+
+        return list(result.values())
+
+    @staticmethod
+    def raw(spec: SpaField, records: Records) -> Optional[List[bytes]]:
+        """Return the record values a field is decoded from."""
+        try:
+            return [records[record][index] for record, index in spec.sources]
+        except (KeyError, IndexError):
+            return None
+
+    def decode_field(self, spec: SpaField, records: Records) -> Any:
+        """Decode a single field returned by lookup() or changed()."""
+        values = self.raw(spec, records)
+
+        if values is None:
+            raise SpaMessageError(f'unable to decode {spec.path}')
+
+        try:
+            return spec.decoder(*values)
+        except SpaDecodeError as error:
+            _LOGGER.warning('unable to decode %s: %s', spec.path, error)
+            return None
+        except ValueError as error:
+            raise SpaMessageError(
+                f'unable to decode {spec.path}'
+            ) from error
+
+    def replace(
+        self,
+        *fields: SpaField,
+        containers: Optional[Dict[str, Type[MyDict]]] = None
+    ) -> SpaSchema:
+        """Return a layout with fields replaced, matched by path.
+
+        Fields with a path that is not in this layout are added.
+        """
+        by_path = {spec.path: spec for spec in self._fields}
+        by_path.update({spec.path: spec for spec in fields})
+
+        return SpaSchema(
+            by_path.values(),
+            {**self._containers, **(containers or {})}
+        )
+
+    def section_records(self, name: str) -> FrozenSet[str]:
+        """Return the records a section is decoded from."""
+        return self._plans[name].records
+
+    def decode(self, records: Records) -> Dict[str, MyDict]:
+        """Decode every section."""
+        return {
+            name: self.decode_section(name, records)
+            for name in self._plans
+        }
+
+    def decode_section(self, name: str, records: Records) -> MyDict:
+        """Decode a single top level section."""
+        plan = self._plans[name]
+        values: List[Any] = [None] * len(plan.paths)
+        slot = 0
+
+        try:
+            for slot, record, index, decoder in plan.leaves:
+                try:
+                    values[slot] = decoder(records[record][index])
+                except SpaDecodeError as error:
+                    # decode the field as None rather than fail the section
+                    _LOGGER.warning(
+                        'unable to decode %s: %s', plan.paths[slot], error
+                    )
+
+            for slot, sources, decoder in plan.composites:
+                values[slot] = decoder(*[
+                    records[record][index] for record, index in sources
+                ])
+        except (KeyError, IndexError, ValueError) as error:
+            raise SpaMessageError(
+                f'unable to decode {plan.paths[slot]}'
+            ) from error
+
+        built: List[MyDict] = []
+
+        for cls, keys in plan.containers:
+            built.append(cls.wrap({
+                key: built[index] if nested else values[index]
+                for key, nested, index in keys
+            }))
+
+        return built[-1]
+
+    @staticmethod
+    def _compile(
+        fields: Sequence[SpaField],
+        containers: Dict[str, Type[MyDict]]
+    ) -> Dict[str, SectionPlan]:
+        # keys of every container in order of first appearance
+        layout: Dict[str, List[str]] = {}
+
+        for spec in fields:
+            parts = spec.path.split('.')
+
+            for depth in range(1, len(parts)):
+                parent = '.'.join(parts[:depth])
+                keys = layout.setdefault(parent, [])
+
+                if parts[depth] not in keys:
+                    keys.append(parts[depth])
+
+        by_path = {spec.path: spec for spec in fields}
+        plans: Dict[str, SectionPlan] = {}
+
+        for section in [path for path in layout if '.' not in path]:
+            paths: List[str] = []
+            built: List[ContainerPlan] = []
+
+            def build(path: str) -> int:
+                keys: List[Tuple[str, bool, int]] = []
+
+                for key in layout[path]:
+                    child = f'{path}.{key}'
+
+                    if child in layout:
+                        keys.append((key, True, build(child)))
+                    else:
+                        paths.append(child)
+                        keys.append((key, False, len(paths) - 1))
+
+                built.append((containers[path], tuple(keys)))
+
+                return len(built) - 1
+
+            build(section)
+
+            leaves: List[LeafPlan] = []
+            composites: List[CompositePlan] = []
+
+            for slot, path in enumerate(paths):
+                spec = by_path[path]
+                # records keep their name at index 0
+                sources = tuple(
+                    (record, index + 1) for record, index in spec.sources
+                )
+
+                if len(sources) == 1:
+                    leaves.append((slot, *sources[0], spec.decoder))
+                else:
+                    composites.append((slot, sources, spec.decoder))
+
+            plans[section] = SectionPlan(
+                tuple(paths),
+                frozenset(
+                    record
+                    for path in paths
+                    for record, _ in by_path[path].sources
+                ),
+                tuple(leaves),
+                tuple(composites),
+                tuple(built)
+            )
+
+        return plans
+
+
+SCHEMA = SpaSchema(FIELDS, CONTAINERS)
+
+
+###############################################################################
+# Registry
+###############################################################################
+
+class SpaSchemaRegistry():
+    """ SpaSchemaRegistry
+
+    Field layouts keyed by controller model and software version, as
+    reported in the R3 record. A layout registered for a software prefix
+    applies to every version starting with it, the longest prefix wins
+    and any other device falls back to the default layout.
+    """
+    def __init__(self, default: SpaSchema) -> None:
+        self._default = default
+        self._layouts: Dict[str, List[Tuple[str, SpaSchema]]] = {}
+        self._selected: Dict[Tuple[bytes, bytes], SpaSchema] = {}
+        self._model = default.lookup('device.model')
+        self._software = default.lookup('device.software')
+
+    @property
+    def default(self) -> SpaSchema:
+        """ default: SpaSchema """
+        return self._default
+
+    def register(self, model: str, software: str, schema: SpaSchema) -> None:
+        """Use a layout for a model and software version prefix."""
+        layouts = self._layouts.setdefault(model, [])
+        layouts.append((software, schema))
+        layouts.sort(key=lambda layout: len(layout[0]), reverse=True)
+        self._selected.clear()
+
+    def get(self, model: str, software: str) -> SpaSchema:
+        """Return the layout for a model and software version."""
+        for prefix, schema in self._layouts.get(model, ()):
+            if software.startswith(prefix):
+                return schema
+
+        return self._default
+
+    def select(self, records: Records) -> SpaSchema:
+        """Return the layout for the spa that sent records."""
+        key = (self._value(self._model, records),
+               self._value(self._software, records))
+        schema = self._selected.get(key)
+
+        if schema is None:
+            schema = self.get(
+                key[0].decode(errors='replace'),
+                key[1].decode(errors='replace')
+            )
+            self._selected[key] = schema
+
+        return schema
+
+    @staticmethod
+    def _value(spec: Optional[SpaField], records: Records) -> bytes:
+        values = None if spec is None else SpaSchema.raw(spec, records)
+
+        return values[0] if values else b''
+
+
+SCHEMAS = SpaSchemaRegistry(SCHEMA)
+SCHEMAS.register('SV3', 'SW V5', SCHEMA)
+
+
+def split_records(data: bytes) -> Records:
+    """Split an RF frame into its records, keyed by record name.
+
+    Field values are left as bytes; each record keeps its name at index 0
+    so field indexes are offset by one.
+    """
+    records: Records = {}
+
+    for line in data.split(b'\n'):
+        line = line.strip(b' ,:*\r')
+
+        if line:
+            items = line.split(b',')
+            records[items[0].decode()] = items
+
+    return records
@@ -0,0 +1,146 @@
+""" SpaSubscription class """
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from .diff import SpaChange
+from .enums import OverflowPolicy
+
+DEFAULT_MAXSIZE = 100
+
+
+class SpaSubscription():
+    """ SpaSubscription
+
+    Bounded queue of changes for one subscriber, iterated with
+    ``async for``. With ``DROP_OLDEST`` every change is queued and the
+    oldest is discarded when the queue is full. With ``COALESCE`` only
+    the latest pending change per field is kept at any time, merged with
+    the value it changed from; when full, the field queued longest ago
+    is discarded.
+    """
+    def __init__(
+        self,
+        paths: Iterable[str] = (),
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        on_close: Optional[Callable[[], None]] = None
+    ) -> None:
+        self._paths: Tuple[str, ...] = tuple(paths)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._on_close = on_close
+        self._queue: Deque[SpaChange] = deque()
+        self._latest: OrderedDict[str, SpaChange] = OrderedDict()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        """ closed: bool """
+        return self._closed
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of changes dropped or coalesced away."""
+        return self._dropped
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        """ paths: Tuple[str, ...] """
+        return self._paths
+
+    def __len__(self) -> int:
+        return len(self._queue) + len(self._latest)
+
+    def matches(self, path: str) -> bool:
+        """Return whether the subscriber is interested in path."""
+        if not self._paths:
+            return True
+
+        for prefix in self._paths:
+            if path == prefix or path.startswith(f'{prefix}.'):
+                return True
+
+        return False
+
+    def put(self, changes: List[SpaChange]) -> None:
+        """Queue the changes the subscriber is interested in."""
+        if self._closed:
+            return
+
+        for change in changes:
+            if not self.matches(change.path):
+                continue
+
+            if self._overflow == OverflowPolicy.COALESCE:
+                self._coalesce(change)
+            else:
+                self._append(change)
+
+        if len(self):
+            self._ready.set()
+
+    def close(self) -> None:
+        """Stop the subscription, ending iteration once drained."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._ready.set()
+
+        if self._on_close is not None:
+            self._on_close()
+
+    async def get(self) -> SpaChange:
+        """Wait for and return the next change."""
+        while not len(self):
+            if self._closed:
+                raise StopAsyncIteration
+
+            self._ready.clear()
+            await self._ready.wait()
+
+        if self._queue:
+            return self._queue.popleft()
+
+        return self._latest.popitem(last=False)[1]
+
+    def _append(self, change: SpaChange) -> None:
+        if len(self._queue) >= self._maxsize:
+            self._queue.popleft()
+            self._dropped += 1
+
+        self._queue.append(change)
+
+    def _coalesce(self, change: SpaChange) -> None:
+        previous = self._latest.pop(change.path, None)
+
+        if previous is not None:
+            self._dropped += 1
+            change = SpaChange(change.path, previous.old, change.new)
+
+            if type(change.old) is type(change.new) \
+                    and change.old == change.new:
+                return
+
+        if len(self._latest) >= self._maxsize:
+            self._latest.popitem(last=False)
+            self._dropped += 1
+
+        self._latest[change.path] = change
+
+    def __aiter__(self) -> SpaSubscription:
+        return self
+
+    async def __anext__(self) -> SpaChange:
+        return await self.get()
+
+    async def __aenter__(self) -> SpaSubscription:
+        return self
+
+    async def __aexit__(self, *exctype: Any) -> None:
+        self.close()
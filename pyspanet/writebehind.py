@@ -0,0 +1,92 @@
+""" SpaWriteBehind class """
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .client import SpaClient
+
+_LOGGER = logging.getLogger(__name__)
+
+Pending = Dict[str, Tuple[Any, List['asyncio.Future[bool]']]]
+
+
+class SpaWriteBehind():
+    """ SpaWriteBehind
+
+    Holds back changes for ``window`` seconds from the first one, then
+    sends only the latest value of each field, all in one batch. Every
+    future handed out for a field resolves with whether the value that
+    was finally sent got acknowledged.
+    """
+    def __init__(self, client: SpaClient, window: float) -> None:
+        self._client = client
+        self._window = window
+        self._pending: Pending = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sending: Set[asyncio.Task[None]] = set()
+
+    @property
+    def window(self) -> float:
+        """ window: float """
+        return self._window
+
+    @property
+    def pending(self) -> Dict[str, Any]:
+        """Return the values held back, by field path."""
+        return {path: value for path, (value, _) in self._pending.items()}
+
+    def submit(self, path: str, value: Any) -> asyncio.Future[bool]:
+        """Hold a value for path, replacing any value still held."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+
+        _, futures = self._pending.get(path, (None, []))
+        futures.append(future)
+        self._pending[path] = (value, futures)
+
+        if self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+
+        return future
+
+    async def flush(self) -> None:
+        """Send the values held back now and wait for every batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._flush()
+
+        if self._sending:
+            await asyncio.gather(*self._sending)
+
+    def _flush(self) -> None:
+        self._timer = None
+        pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        task = asyncio.ensure_future(self._send(pending))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, pending: Pending) -> None:
+        _LOGGER.debug("Write behind: %s", list(pending))
+
+        try:
+            acks = await self._client.apply({
+                path: value for path, (value, _) in pending.items()
+            })
+        except Exception as error:
+            for _, futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        for path, (_, futures) in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(acks[path])
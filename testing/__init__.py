@@ -0,0 +1,5 @@
+"""Test support shared by the tests and the benchmarks.
+
+Lives in the checkout rather than the package, like ``tests`` and
+``benchmarks``, since it reads the RF frames under ``tests/fixtures``.
+"""
@@ -0,0 +1,142 @@
+"""Local stand-in for the SpaNet relay, for the tests and benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from pyspanet.net import SpaNetConfig
+
+CONNECT_SUCCESS = b'Successfully connected'
+
+# RF frames captured from real spas, found from any working directory
+FIXTURES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'tests',
+    'fixtures'
+)
+
+
+def load_frame(name: str = 'vortex/mercury') -> bytes:
+    """Load an RF frame from the fixtures directory."""
+    with open(os.path.join(FIXTURES, f'{name}.txt'), 'rb') as file:
+        return file.read()
+
+
+def patch_frame(data: bytes, record: str, index: int, value: str) -> bytes:
+    """Return a copy of an RF frame with one record field replaced."""
+    lines = data.split(b'\n')
+
+    for i, line in enumerate(lines):
+        items = line.split(b',')
+
+        if len(items) > 1 and items[1] == record.encode():
+            items[index + 2] = value.encode()
+            lines[i] = b','.join(items)
+
+    return b'\n'.join(lines)
+
+
+class SpaServer():
+    """ SpaServer """
+    def __init__(
+        self,
+        handler: Optional[Callable[[str], Optional[bytes]]] = None
+    ) -> None:
+        self.handler = handler or self.default_handler
+        self.frame = load_frame()
+        self.received: List[str] = []
+        self.connections = 0
+        self.chunk_size: Optional[int] = None
+        self.delay = 0.0
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def port(self) -> int:
+        """ port: int """
+        assert self._server is not None
+        return int(self._server.sockets[0].getsockname()[1])
+
+    def config(self, **kwargs: Any) -> SpaNetConfig:
+        """Return a client config pointing at this server."""
+        config: Dict[str, Any] = {
+            'spaurl': f'127.0.0.1:{self.port}',
+            'id_member': 1,
+            'id': 2
+        }
+        config.update(kwargs)
+
+        return SpaNetConfig(config)
+
+    def default_handler(self, msg: str) -> Optional[bytes]:
+        """Answer like a spa controller would."""
+        if msg == 'RF':
+            return self.frame
+
+        cmd, _, value = msg.partition(':')
+
+        if cmd in {'S22', 'S23', 'S24', 'S25', 'S26', 'S28'}:
+            return f'{cmd}-OK\r\n'.encode()
+
+        if not value:
+            return f'{cmd}\r\n'.encode()
+
+        return f'{value}\r\n'.encode()
+
+    async def start(self) -> SpaServer:
+        """Start listening on an ephemeral port."""
+        self._server = await asyncio.start_server(
+            self._handle, '127.0.0.1', 0
+        )
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+
+        try:
+            await reader.readuntil(b'>')
+            writer.write(CONNECT_SUCCESS)
+
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                msg = line.decode().strip()
+                self.received.append(msg)
+
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+
+                reply = self.handler(msg)
+
+                if reply is None:
+                    continue
+
+                await self._write(writer, reply)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        if not self.chunk_size:
+            writer.write(data)
+            await writer.drain()
+            return
+
+        for i in range(0, len(data), self.chunk_size):
+            writer.write(data[i:i + self.chunk_size])
+            await writer.drain()
+            await asyncio.sleep(0)
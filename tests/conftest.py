@@ -0,0 +1,16 @@
+"""Shared fixtures."""
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import pytest_asyncio
+
+from testing.spa_server import SpaServer
+
+
+@pytest_asyncio.fixture(name='server')
+async def server_fixture() -> AsyncIterator[SpaServer]:
+    """ local SpaNet relay """
+    server = await SpaServer().start()
+    yield server
+    await server.stop()
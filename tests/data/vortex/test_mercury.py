@@ -15,6 +15,7 @@ from pyspanet.collections import (
     FloatCodedInteger,
     HeatPumpDict,
     LightDict,
+    PowerDict,
     PowerSaveDict,
     PumpDict,
     PumpsDict,
@@ -96,6 +97,15 @@ def test_vortex_mercury_lights(vortex_mercury: SpaData) -> None:
     assert vortex_mercury.lights.state == OffOnState.OFF
 
 
+def test_vortex_mercury_power(vortex_mercury: SpaData) -> None:
+    """ test Vortex Mercury power data """
+    assert isinstance(vortex_mercury.power, PowerDict)
+    assert vortex_mercury.power.current == 0
+    assert vortex_mercury.power.current_limit == 32
+    assert vortex_mercury.power.heat_element_current == 0
+    assert vortex_mercury.power.voltage == 249
+
+
 def test_vortex_mercury_pumps(vortex_mercury: SpaData) -> None:
     """ test Vortex Mercury pumps data """
     assert isinstance(vortex_mercury.pumps, PumpsDict)
@@ -155,11 +165,11 @@ def test_vortex_mercury_temperature(vortex_mercury: SpaData) -> None:
     assert isinstance(vortex_mercury.temperature.heater, FloatCodedInteger)
     assert isinstance(vortex_mercury.temperature.target, FloatCodedInteger)
     assert isinstance(vortex_mercury.temperature.water, FloatCodedInteger)
-    assert vortex_mercury.temperature.heater == 27.3
+    assert vortex_mercury.temperature.heater.matches(27.3)
     assert vortex_mercury.temperature.heater == 273
-    assert vortex_mercury.temperature.target == 20.0
+    assert vortex_mercury.temperature.target.matches(20.0)
     assert vortex_mercury.temperature.target == 200
-    assert vortex_mercury.temperature.water == 28.6
+    assert vortex_mercury.temperature.water.matches(28.6)
     assert vortex_mercury.temperature.water == 286
 
 
@@ -242,19 +252,19 @@ def test_vortex_mercury_settings_data(vortex_mercury: SpaData) -> None:
 
     assert vortex_mercury.settings.power_save.state == PowerSave.OFF
     assert vortex_mercury.settings.power_save.peak.start == 3584
-    assert vortex_mercury.settings.power_save.peak.start == '14:00'
+    assert vortex_mercury.settings.power_save.peak.start.matches('14:00')
     assert vortex_mercury.settings.power_save.peak.stop == 5376
-    assert vortex_mercury.settings.power_save.peak.stop == '21:00'
+    assert vortex_mercury.settings.power_save.peak.stop.matches('21:00')
 
     assert vortex_mercury.settings.sleep.timer1.state == SleepTimer.EVERYDAY
     assert vortex_mercury.settings.sleep.timer1.start == 5662
-    assert vortex_mercury.settings.sleep.timer1.start == '22:30'
+    assert vortex_mercury.settings.sleep.timer1.start.matches('22:30')
     assert vortex_mercury.settings.sleep.timer1.stop == 1792
-    assert vortex_mercury.settings.sleep.timer1.stop == '7:00'
+    assert vortex_mercury.settings.sleep.timer1.stop.matches('7:00')
     assert vortex_mercury.settings.sleep.timer2.state == SleepTimer.OFF
     assert vortex_mercury.settings.sleep.timer2.start == 5632
-    assert vortex_mercury.settings.sleep.timer2.start == '22:00'
+    assert vortex_mercury.settings.sleep.timer2.start.matches('22:00')
     assert vortex_mercury.settings.sleep.timer2.stop == 1792
-    assert vortex_mercury.settings.sleep.timer2.stop == '7:00'
+    assert vortex_mercury.settings.sleep.timer2.stop.matches('7:00')
 
     assert vortex_mercury.settings.time_out == 30
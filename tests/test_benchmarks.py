@@ -0,0 +1,43 @@
+"""Tests module."""
+from __future__ import annotations
+
+from benchmarks.compare import compare
+from benchmarks.corpus import corpus
+from benchmarks.suite import run_benchmarks
+from pyspanet.data import SpaData
+
+
+def test_corpus() -> None:
+    """ test the corpus frames all parse and differ """
+    frames = corpus(16)
+
+    assert len(set(frames)) == 16
+    assert all(SpaData(frame).device.model == 'SV3' for frame in frames)
+
+
+def test_run_benchmarks() -> None:
+    """ test running a benchmark """
+    [result] = run_benchmarks(['access'], size=2, duration=0.01)
+
+    assert result.name == 'access'
+    assert result.rate > 0
+    assert result.peak_memory > 0
+
+
+def test_compare() -> None:
+    """ test slower or larger benchmarks are flagged """
+    base = {
+        'parse': {'unit': 'frames/s', 'rate': 1000, 'peak_memory': 100},
+        'access': {'unit': 'reads/s', 'rate': 1000, 'peak_memory': 100},
+        'apply': {'unit': 'frames/s', 'rate': 1000, 'peak_memory': 100},
+    }
+    head = {
+        'parse': {'unit': 'frames/s', 'rate': 950, 'peak_memory': 105},
+        'access': {'unit': 'reads/s', 'rate': 800, 'peak_memory': 100},
+        'apply': {'unit': 'frames/s', 'rate': 1000, 'peak_memory': 150},
+        'client': {'unit': 'commands/s', 'rate': 10, 'peak_memory': 1},
+    }
+
+    assert [
+        (item.name, item.regressed) for item in compare(base, head, 0.1)
+    ] == [('parse', False), ('access', True), ('apply', True)]
@@ -0,0 +1,223 @@
+"""Tests module."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from pyspanet.diff import SpaChange
+from pyspanet.enums import LightColour, OffOnAutoState, OffOnState
+from pyspanet.exceptions import SpaTimeoutError
+from pyspanet.net import SpaNetClient
+from pyspanet.reconnect import SpaReconnectConfig
+from testing.spa_server import SpaServer, patch_frame
+
+
+@pytest.mark.asyncio
+async def test_refresh_single_flight(server: SpaServer) -> None:
+    """ test concurrent refreshes share one request """
+    async with SpaNetClient(server.config()) as spa:
+        server.delay = 0.1
+        server.received.clear()
+
+        results = await asyncio.gather(*(spa.refresh() for _ in range(5)))
+        data = spa.data
+
+        assert results == [True] * 5
+        assert server.received == ['RF']
+        assert spa.refresh_count == 2
+        assert spa.refresh_coalesced == 4
+
+        assert await spa.refresh()
+        assert spa.data is data
+        assert spa.refresh_count == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_refresh(server: SpaServer) -> None:
+    """ test a refresh right after one completes sends its own request """
+    async with SpaNetClient(server.config()) as spa:
+        server.received.clear()
+        server.frame = patch_frame(server.frame, 'R5', 14, '290')
+
+        # runs as the first refresh finishes, before its done-callbacks
+        refreshes: List[asyncio.Future[bool]] = []
+        spa.add_listener(
+            lambda _: refreshes.append(asyncio.ensure_future(spa.refresh()))
+        )
+
+        assert await spa.refresh()
+        assert await asyncio.gather(*refreshes) == [True]
+        assert server.received == ['RF', 'RF']
+        assert spa.refresh_count == 3
+        assert spa.refresh_coalesced == 0
+
+        assert await spa.refresh()
+        assert server.received == ['RF', 'RF', 'RF']
+        assert spa.refresh_coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_get_data_max_age(server: SpaServer) -> None:
+    """ test cached reads only refresh stale data """
+    async with SpaNetClient(server.config()) as spa:
+        data = spa.data
+        timestamp = data.timestamp
+        assert data.age < 5
+
+        assert await spa.get_data(max_age=60) is data
+        assert spa.refresh_count == 1
+
+        assert await spa.get_data(max_age=0) is data
+        assert data.timestamp > timestamp
+        assert spa.refresh_count == 2
+
+
+@pytest.mark.asyncio
+async def test_listener(server: SpaServer) -> None:
+    """ test listeners receive the changed fields """
+    async with SpaNetClient(server.config()) as spa:
+        received: List[List[SpaChange]] = []
+        remove = spa.add_listener(received.append)
+
+        assert await spa.refresh()
+        assert not received
+
+        server.frame = patch_frame(server.frame, 'R5', 14, '290')
+        assert await spa.refresh()
+        assert received == [[SpaChange('temperature.water', 286, 290)]]
+
+        remove()
+        server.frame = patch_frame(server.frame, 'R5', 14, '291')
+        assert await spa.refresh()
+        assert len(received) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_place(server: SpaServer) -> None:
+    """ test refreshes update the snapshot in place """
+    async with SpaNetClient(server.config()) as spa:
+        settings = spa.data.settings
+
+        assert await spa.lights_control(LightColour.COLOUR_3)
+        assert spa.data.lights.colour == LightColour.COLOUR_3
+
+        # the spa did not take the change, so the next refresh reverts it
+        received: List[List[SpaChange]] = []
+        spa.add_listener(received.append)
+        assert await spa.refresh()
+
+        assert spa.data.lights.colour == LightColour.COLOUR_29
+        assert spa.data.settings is settings
+        assert received == [[SpaChange(
+            'lights.colour', LightColour.COLOUR_3, LightColour.COLOUR_29
+        )]]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_refresh(server: SpaServer) -> None:
+    """ test the frame read by the heartbeat updates the data """
+    config = server.config(heartbeat_interval=0.05)
+
+    async with SpaNetClient(config) as spa:
+        received: List[List[SpaChange]] = []
+        spa.add_listener(received.append)
+        server.frame = patch_frame(server.frame, 'R5', 14, '290')
+
+        await asyncio.sleep(0.08)
+
+        assert server.received == ['RF', 'RF']
+        assert spa.refresh_count == 1
+        assert received == [[SpaChange('temperature.water', 286, 290)]]
+
+
+@pytest.mark.asyncio
+async def test_pump_control_profile(server: SpaServer) -> None:
+    """ test pump commands are checked against the spa's profile """
+    async with SpaNetClient(server.config()) as spa:
+        assert spa.profile.installed == ('pump1', 'pump2', 'pump3')
+
+        assert not await spa.pump1_control(OffOnState.ON)
+        assert not await spa.pump4_control(OffOnState.ON)
+        assert server.received == ['RF']
+
+        assert await spa.pump1_control(OffOnAutoState.ON)
+        assert spa.data.pumps.pump1.state == OffOnAutoState.ON
+
+
+@pytest.mark.asyncio
+async def test_timeouts(server: SpaServer) -> None:
+    """ test commands give up at their timeout or deadline """
+    config = server.config(reconnect=SpaReconnectConfig(base_delay=0))
+
+    async with SpaNetClient(config) as spa:
+        server.delay = 0.2
+
+        with pytest.raises(SpaTimeoutError):
+            await spa.lights_control(LightColour.COLOUR_3, timeout=0.05)
+
+        assert spa.data.lights.colour == LightColour.COLOUR_29
+
+        with pytest.raises(SpaTimeoutError):
+            await spa.get_data(max_age=0, deadline=time.monotonic() + 0.05)
+
+        server.delay = 0
+        assert await spa.refresh(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_apply(server: SpaServer) -> None:
+    """ test several settings pipelined as one batch """
+    async with SpaNetClient(server.config()) as spa:
+        server.received.clear()
+
+        with pytest.raises(ValueError):
+            await spa.apply({
+                'lights.colour': LightColour.COLOUR_3,
+                'pumps.pump4.state': OffOnState.ON,
+            })
+
+        with pytest.raises(ValueError):
+            await spa.apply({'temperature.water': 30})
+
+        assert not server.received
+
+        server.handler = lambda msg: (
+            b'0\r\n' if msg == 'W40:375'
+            else server.default_handler(msg)
+        )
+
+        assert await spa.apply({
+            'lights.state': OffOnState.ON,
+            'lights.colour': LightColour.COLOUR_3,
+            'temperature.target': 37.5,
+            'pumps.pump1.state': OffOnAutoState.ON,
+        }) == {
+            'lights.state': True,
+            'lights.colour': True,
+            'temperature.target': False,
+            'pumps.pump1.state': True,
+        }
+        assert server.received == ['W14', 'S10:3', 'W40:375', 'S22:1']
+        assert spa.data.lights.colour == LightColour.COLOUR_3
+        assert spa.data.pumps.pump1.state == OffOnAutoState.ON
+        assert not spa.data.temperature.target.matches(37.5)
+
+
+@pytest.mark.asyncio
+async def test_apply_rejected(server: SpaServer) -> None:
+    """ test a command answered with an error fails on its own """
+    async with SpaNetClient(server.config()) as spa:
+        server.handler = lambda msg: (
+            b'ERR\r\n' if msg.startswith('W40:')
+            else server.default_handler(msg)
+        )
+
+        assert await spa.apply({
+            'lights.colour': LightColour.COLOUR_3,
+            'temperature.target': 37.5,
+        }) == {'lights.colour': True, 'temperature.target': False}
+        assert spa.data.lights.colour == LightColour.COLOUR_3
+        assert not await spa.temperature(37.5)
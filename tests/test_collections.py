@@ -1,7 +1,15 @@
 """Tests module."""
 from __future__ import annotations
 
-from pyspanet.collections import FloatCodedInteger, TimeCodedInteger
+import pytest
+
+from pyspanet.collections import (
+    FloatCodedInteger,
+    PumpDict,
+    SleepTimerDict,
+    TimeCodedInteger,
+)
+from pyspanet.enums import OffOnState, SleepTimer
 
 
 def test_float_coded_integer() -> None:
@@ -9,25 +17,25 @@ def test_float_coded_integer() -> None:
     fci = FloatCodedInteger(325)
     assert fci == 325
     assert int(fci) == 325
-    assert fci == 32.5
+    assert fci.matches(32.5)
     assert float(fci) == 32.5
-    assert fci == '32.5'
+    assert fci.matches('32.5')
     assert str(fci) == '32.5'
 
     fci = FloatCodedInteger(26.7)
     assert fci == 267
     assert int(fci) == 267
-    assert fci == 26.7
+    assert fci.matches(26.7)
     assert float(fci) == 26.7
-    assert fci == '26.7'
+    assert fci.matches('26.7')
     assert str(fci) == '26.7'
 
     fci = FloatCodedInteger('19.8')
     assert fci == 198
     assert int(fci) == 198
-    assert fci == 19.8
+    assert fci.matches(19.8)
     assert float(fci) == 19.8
-    assert fci == '19.8'
+    assert fci.matches('19.8')
     assert str(fci) == '19.8'
 
 
@@ -36,13 +44,13 @@ def test_time_coded_integer() -> None:
     tci = TimeCodedInteger(5120)
     assert tci == 5120
     assert int(tci) == 5120
-    assert tci == '20:00'
+    assert tci.matches('20:00')
     assert str(tci) == '20:00'
 
     tci = TimeCodedInteger('7:45')
     assert tci == 1837
     assert int(tci) == 1837
-    assert tci == '7:45'
+    assert tci.matches('7:45')
     assert str(tci) == '7:45'
 
     # bounds checking
@@ -54,3 +62,62 @@ def test_time_coded_integer() -> None:
     tci = TimeCodedInteger(5948)
     assert tci != 5948
     assert tci == 5947
+
+
+def test_records() -> None:
+    """ test slots based records """
+    timer = SleepTimerDict(
+        state=SleepTimer.EVERYDAY,
+        start=TimeCodedInteger('22:00')
+    )
+    assert not hasattr(timer, '__dict__')
+    assert timer.start.matches('22:00')
+    assert timer['state'] == SleepTimer.EVERYDAY
+    assert list(timer) == ['start', 'state']
+    assert 'stop' not in timer
+    assert timer == {'start': 5632, 'state': SleepTimer.EVERYDAY}
+
+    with pytest.raises(AttributeError):
+        _ = timer.stop
+
+    with pytest.raises(KeyError):
+        _ = timer['stop']
+
+    with pytest.raises(KeyError):
+        timer['other'] = 1
+
+    timer.update({'stop': TimeCodedInteger('6:00')})
+    assert dict(timer.items()) == {
+        'start': 5632,
+        'stop': 1536,
+        'state': SleepTimer.EVERYDAY,
+    }
+    assert timer.copy() == timer
+    assert timer.copy() is not timer
+
+    del timer['stop']
+    assert len(timer) == 2
+
+    pump = PumpDict(installed=OffOnState.OFF)
+    assert pump.speed is None
+    assert pump.state is None
+    assert list(pump) == ['installed']
+
+
+def test_coded_integer_hash() -> None:
+    """ test coded integers compare and hash like their integer value """
+    fci = FloatCodedInteger('28.6')
+    assert not fci.matches(28.7)
+    assert not fci.matches('28.7')
+    assert fci != 28.6
+    assert fci is FloatCodedInteger(286)
+    assert {fci: 'water'}[286] == 'water'
+    assert FloatCodedInteger(b'286') in {fci}
+    assert FloatCodedInteger(1000) == 1000
+
+    tci = TimeCodedInteger('22:00')
+    assert not tci.matches('22:01')
+    assert tci != '22:00'
+    assert tci is TimeCodedInteger(b'5632')
+    assert tci in {5632}
+    assert TimeCodedInteger(9999) is TimeCodedInteger('23:59')
@@ -0,0 +1,43 @@
+"""Tests module."""
+from __future__ import annotations
+
+from pyspanet.net import SpaNetConfig
+from pyspanet.reconnect import SpaReconnectConfig
+
+
+def test_options() -> None:
+    """ test SpaConfig fields are read from the config dict """
+    config = SpaNetConfig({
+        'spaurl': '127.0.0.1:9090',
+        'id_member': 1,
+        'id': 2,
+        'lazy': True,
+        'keepalive': False,
+        'heartbeat_interval': 30,
+        'reconnect': {'base_delay': 2, 'failure_threshold': 3},
+        'write_behind_window': 0.5,
+    })
+
+    assert config.host == '127.0.0.1'
+    assert config.lazy
+    assert not config.keepalive
+    assert config.heartbeat_interval == 30
+    assert config.reconnect == SpaReconnectConfig(
+        base_delay=2, failure_threshold=3
+    )
+    assert config.write_behind_window == 0.5
+
+
+def test_default_options() -> None:
+    """ test SpaConfig fields default when not in the config dict """
+    config = SpaNetConfig({
+        'spaurl': '127.0.0.1:9090',
+        'id_member': 1,
+        'id': 2,
+    })
+
+    assert not config.lazy
+    assert config.keepalive
+    assert config.heartbeat_interval is None
+    assert config.reconnect is None
+    assert config.write_behind_window == 0.25
@@ -0,0 +1,215 @@
+"""Tests module."""
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from typing import Optional
+
+import pytest
+
+from pyspanet import SpaData
+from pyspanet.const import CMD_PUMP1, CMD_PUMP2, CMD_REFRESH
+from pyspanet.enums import OffOnState
+from pyspanet.exceptions import SpaTimeoutError
+from pyspanet.net import SpaNetConnection
+from pyspanet.parser import RFParser
+from pyspanet.reconnect import SpaReconnectConfig
+from testing.spa_server import SpaServer
+
+
+@pytest.mark.asyncio
+async def test_connect_disconnect(server: SpaServer) -> None:
+    """ test connecting to the relay """
+    connection = SpaNetConnection(server.config())
+    assert not connection.connected
+
+    assert await connection.connect()
+    assert connection.connected
+
+    await connection.disconnect()
+    assert not connection.connected
+
+
+@pytest.mark.asyncio
+async def test_send(server: SpaServer) -> None:
+    """ test command round trips """
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    assert await connection.send(CMD_PUMP1, OffOnState.ON)
+    assert server.received == ['S22:1']
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_connections(server: SpaServer) -> None:
+    """ test many spas driven from one loop """
+    server.delay = 0.1
+    connections = [SpaNetConnection(server.config()) for _ in range(10)]
+
+    await asyncio.gather(*(c.connect() for c in connections))
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(c.send(CMD_REFRESH) for c in connections))
+
+    # ten round trips of 0.1s each overlap instead of serialising
+    assert loop.time() - start < 0.5
+
+    await asyncio.gather(*(c.disconnect() for c in connections))
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_small_segments(server: SpaServer) -> None:
+    """ test an RF response delivered in small TCP segments """
+    server.chunk_size = 64
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    result = await connection.send(CMD_REFRESH)
+
+    assert isinstance(result, RFParser)
+    assert SpaData(result).temperature.water.matches(28.6)
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands(server: SpaServer) -> None:
+    """ test concurrent callers sharing one connection """
+    server.chunk_size = 64
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    results = await asyncio.gather(
+        connection.send(CMD_REFRESH),
+        connection.send(CMD_PUMP1, OffOnState.ON),
+        connection.send(CMD_REFRESH),
+        connection.send(CMD_PUMP1, OffOnState.OFF),
+    )
+
+    assert server.received == ['RF', 'S22:1', 'RF', 'S22:0']
+    assert isinstance(results[0], RFParser)
+    assert results[1] is True
+    assert isinstance(results[2], RFParser)
+    assert results[3] is True
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_send_many(server: SpaServer) -> None:
+    """ test a batch is written before its answers are read """
+    def handler(msg: str) -> Optional[bytes]:
+        # answers nothing until the whole batch has arrived
+        if len(server.received) < 3:
+            return None
+
+        return b'S22-OK\r\nS23-OK\r\nS22\r\n'
+
+    server.handler = handler
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    assert await connection.send_many([
+        (CMD_PUMP1, OffOnState.ON),
+        (CMD_PUMP2, OffOnState.ON),
+        (CMD_PUMP1, OffOnState.OFF),
+    ], timeout=1) == [True, True, False]
+    assert server.received == ['S22:1', 'S23:1', 'S22:0']
+    assert await connection.send_many([]) == []
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_releases_callers(server: SpaServer) -> None:
+    """ test queued callers are released on disconnect """
+    server.delay = 0.5
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    pending = asyncio.gather(
+        connection.send(CMD_PUMP1, OffOnState.ON),
+        connection.send(CMD_PUMP1, OffOnState.OFF),
+    )
+    await asyncio.sleep(0.1)
+    await connection.disconnect()
+
+    assert await pending == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_keepalive(server: SpaServer) -> None:
+    """ test TCP keepalive is enabled on the socket """
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+
+    assert connection._writer is not None
+    sock = connection._writer.get_extra_info('socket')
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat(server: SpaServer) -> None:
+    """ test an idle link is probed and a dead one noticed """
+    # keep the dead link down rather than reconnect straight away
+    connection = SpaNetConnection(server.config(
+        heartbeat_interval=0.05,
+        reconnect=SpaReconnectConfig(failure_threshold=1)
+    ))
+    await connection.connect()
+    seen = connection.last_seen
+
+    await asyncio.sleep(0.08)
+    assert server.received == [CMD_REFRESH]
+    assert connection.last_seen > seen
+
+    # commands keep the link busy, so no probe is needed
+    for _ in range(4):
+        assert await connection.send(CMD_PUMP1, OffOnState.ON)
+        await asyncio.sleep(0.02)
+
+    assert server.received.count(CMD_REFRESH) == 1
+
+    def hang_up(msg: str) -> None:
+        raise ConnectionError
+
+    server.handler = hang_up
+    await asyncio.sleep(0.1)
+    assert not connection.connected
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_send_timeout(server: SpaServer) -> None:
+    """ test a silent spa times out and the link is reset """
+    connection = SpaNetConnection(server.config(
+        reconnect=SpaReconnectConfig(base_delay=0)
+    ))
+    await connection.connect()
+    server.delay = 0.2
+
+    with pytest.raises(SpaTimeoutError):
+        await connection.send(CMD_PUMP1, OffOnState.ON, timeout=0.05)
+
+    assert not connection.connected
+
+    # queued behind a slow command, the deadline still applies
+    slow = asyncio.ensure_future(connection.send(CMD_REFRESH))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(SpaTimeoutError):
+        await connection.send(
+            CMD_PUMP1, OffOnState.ON, deadline=time.monotonic() + 0.05
+        )
+
+    assert isinstance(await slow, RFParser)
+    assert server.received == ['S22:1', 'RF']
+
+    await connection.disconnect()
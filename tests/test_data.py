@@ -0,0 +1,80 @@
+"""Tests module."""
+from __future__ import annotations
+
+from pyspanet import SpaData
+from pyspanet.diff import SpaChange
+from testing.spa_server import load_frame, patch_frame
+
+
+def test_lazy_decoding() -> None:
+    """ test lazy snapshots decode sections on first access """
+    data = SpaData(load_frame().decode(), lazy=True)
+    assert not data._sections
+
+    assert data.water_temperature.matches(28.6)
+    assert list(data._sections) == ['temperature']
+    assert data.temperature is data.temperature
+
+    assert data.heating == SpaData(load_frame().decode()).heating
+    assert list(data._sections) == ['temperature', 'state']
+
+
+def test_lazy_diff() -> None:
+    """ test diffing lazy snapshots only decodes changed sections """
+    frame = load_frame()
+    old = SpaData(frame.decode(), lazy=True)
+    new = SpaData(patch_frame(frame, 'RC', 9, '1').decode(), lazy=True)
+
+    assert new.diff(old) == [SpaChange('blower.state', 2, 1)]
+    assert list(new._sections) == ['blower']
+
+
+def test_bytes_input() -> None:
+    """ test str, bytes and memoryview frames parse the same """
+    frame = load_frame()
+    data = SpaData(frame)
+
+    assert not data.diff(SpaData(frame.decode()))
+    assert not data.diff(SpaData(memoryview(frame)))
+    assert data.device.model == 'SV3'
+    assert isinstance(data.device.model, str)
+
+
+def test_apply() -> None:
+    """ test applying a newer frame in place """
+    frame = load_frame()
+    data = SpaData(frame)
+    pumps = data.pumps
+    changed = patch_frame(frame, 'R5', 14, '290')
+    changed = patch_frame(changed, 'R5', 17, '0')
+
+    assert data.apply(frame) == []
+    assert data.apply(changed) == [
+        SpaChange('pumps.pump1.state', 4, 0),
+        SpaChange('temperature.water', 286, 290),
+    ]
+    assert data.pumps is pumps
+    assert data.water_temperature.matches(29.0)
+    assert not data.diff(SpaData(changed))
+
+
+def test_apply_lazy() -> None:
+    """ test applying to undecoded sections reports old values """
+    frame = load_frame()
+    data = SpaData(frame, lazy=True)
+
+    assert data.apply(patch_frame(frame, 'R5', 14, '290')) == [
+        SpaChange('temperature.water', 286, 290),
+    ]
+    assert not data._sections
+    assert data.water_temperature.matches(29.0)
+
+
+def test_set_is_reverted_by_apply() -> None:
+    """ test local changes are decoded again from the next frame """
+    frame = load_frame()
+    data = SpaData(frame)
+    data.set('pumps.pump2.state', 1)
+
+    assert data.apply(frame) == [SpaChange('pumps.pump2.state', 1, 0)]
+    assert data.apply(frame) == []
@@ -0,0 +1,42 @@
+"""Tests module."""
+from __future__ import annotations
+
+from pyspanet import SpaData
+from pyspanet.diff import SpaChange
+from pyspanet.enums import OffOnAutoState, OffOnState
+from testing.spa_server import load_frame, patch_frame
+
+
+def test_diff_unchanged() -> None:
+    """ test identical snapshots have no changes """
+    frame = load_frame().decode()
+
+    assert not SpaData(frame).diff(SpaData(frame))
+
+
+def test_diff_changed_fields() -> None:
+    """ test only the changed fields are reported """
+    frame = load_frame()
+    changed = patch_frame(frame, 'R5', 14, '290')
+    changed = patch_frame(changed, 'R5', 17, '0')
+    changed = patch_frame(changed, 'R6', 12, '128')
+
+    old = SpaData(frame.decode())
+    new = SpaData(changed.decode())
+
+    assert new.diff(old) == [
+        SpaChange('pumps.pump1.state', OffOnAutoState.AUTO,
+                  OffOnAutoState.OFF),
+        SpaChange('settings.sleep.timer1.state', 127, 128),
+        SpaChange('temperature.water', 286, 290),
+    ]
+
+
+def test_diff_initial() -> None:
+    """ test every field is reported without a previous snapshot """
+    changes = SpaData(load_frame().decode()).diff(None)
+    paths = [change.path for change in changes]
+
+    assert 'temperature.water' in paths
+    assert 'settings.sleep.timer2.stop' in paths
+    assert SpaChange('lights.state', None, OffOnState.OFF) in changes
@@ -0,0 +1,54 @@
+"""Tests module."""
+from __future__ import annotations
+
+import pytest
+
+from pyspanet.exceptions import SpaMessageError
+from pyspanet.framing import SpaFrameReader
+from pyspanet.parser import RFParser
+from testing.spa_server import load_frame
+
+
+def test_refresh_frame_in_chunks() -> None:
+    """ test an RF response split over several reads """
+    data = load_frame()
+    split = data.rindex(b':*')
+    reader = SpaFrameReader()
+
+    for i in range(0, split, 100):
+        reader.feed(data[i:min(i + 100, split)])
+        assert reader.frame() is None
+
+    reader.feed(data[split:])
+    frame = reader.frame()
+
+    assert isinstance(frame, RFParser)
+    assert frame.done
+    assert frame.records()['RG'][-1] == b'0'
+    assert reader.frame() is None
+
+
+def test_ack_frames() -> None:
+    """ test ack, echo and integer responses """
+    reader = SpaFrameReader()
+
+    reader.feed(b'S22-')
+    assert reader.frame() is None
+
+    reader.feed(b'OK\r\nW12\r\n2')
+    assert reader.frame() == b'S22-OK\r'
+    assert reader.frame() == b'W12\r'
+    assert reader.frame() is None
+
+    reader.feed(b'00\r\n')
+    assert reader.frame() == b'200\r'
+
+
+def test_buffer_is_bounded() -> None:
+    """ test the buffer limit """
+    reader = SpaFrameReader(max_size=16)
+
+    with pytest.raises(SpaMessageError):
+        reader.feed(b'RF:' + b'0' * 16)
+
+    assert len(reader) == 0
@@ -0,0 +1,56 @@
+"""Tests module."""
+from __future__ import annotations
+
+import pytest
+
+from pyspanet import SpaData
+from pyspanet.exceptions import SpaMessageError
+from pyspanet.parser import RFParser
+from testing.spa_server import load_frame
+
+
+def test_feed_byte_by_byte() -> None:
+    """ test records complete as soon as they are terminated """
+    data = load_frame()
+    parser = RFParser()
+    end = data.index(b',R3,')
+
+    for i in range(end):
+        assert not parser.feed(data[i:i + 1])
+
+    assert list(parser.records()) == ['RF', 'R2']
+
+    for i in range(end, len(data)):
+        parser.feed(data[i:i + 1])
+
+    assert parser.done
+    assert parser.records()['R3'][7] == b'SV3'
+    assert not parser.result().diff(SpaData(data))
+
+
+def test_remainder() -> None:
+    """ test bytes after the RG record are kept """
+    data = load_frame().rstrip()
+    parser = RFParser()
+
+    assert parser.feed(data + b'\r\nS22-OK')
+    assert parser.remainder == b'S22-OK'
+
+    # the RG record ends the response without waiting for its line end
+    parser = RFParser()
+    assert parser.feed(data + b'S22-OK\r\n')
+    assert parser.remainder == b'S22-OK\r\n'
+    assert parser.records()['RG'][-1] == b'0'
+
+
+def test_incomplete() -> None:
+    """ test incomplete and oversized responses """
+    data = load_frame()
+    parser = RFParser()
+    parser.feed(data[:200])
+
+    with pytest.raises(SpaMessageError):
+        parser.result()
+
+    with pytest.raises(SpaMessageError):
+        RFParser(max_size=100).feed(data)
@@ -0,0 +1,64 @@
+"""Tests module."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pyspanet.enums import OffOnState
+from pyspanet.net import SpaNetClient
+from pyspanet.poller import SpaPoller, SpaPollerConfig
+from testing.spa_server import SpaServer
+
+
+@pytest.mark.asyncio
+async def test_poller_backoff(server: SpaServer) -> None:
+    """ test the poller backs off while idle and speeds up on activity """
+    config = SpaPollerConfig(
+        active_interval=1,
+        idle_interval=10,
+        max_interval=60,
+        jitter=0,
+        active_hold=0
+    )
+
+    async with SpaNetClient(server.config()) as spa:
+        poller = SpaPoller(spa, config)
+
+        assert not poller.active
+        assert poller._next_interval(True) == 10
+        assert poller._next_interval(True) == 20
+        assert poller._next_interval(True) == 40
+        assert poller._next_interval(True) == 60
+        assert poller._next_interval(True) == 60
+
+        spa.data.state.update({'heat': OffOnState.ON})
+        assert poller.active
+        assert poller._next_interval(True) == 1
+
+        # failed polls back off even while active
+        assert poller._next_interval(False) == 10
+
+
+@pytest.mark.asyncio
+async def test_poller_kick(server: SpaServer) -> None:
+    """ test a command brings the next poll forward """
+    config = SpaPollerConfig(
+        active_interval=0.05,
+        idle_interval=10,
+        jitter=0,
+        active_hold=0
+    )
+
+    async with SpaNetClient(server.config()) as spa:
+        spa.start_polling(config)
+        await asyncio.sleep(0.05)
+        count = spa.refresh_count
+
+        assert await spa.pump1_control(spa.data.pumps.pump1.state)
+        await asyncio.sleep(0.2)
+
+        assert spa.refresh_count == count + 1
+
+        await spa.stop_polling()
+        assert spa.poller is None
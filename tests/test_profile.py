@@ -0,0 +1,46 @@
+"""Tests module."""
+from __future__ import annotations
+
+import pytest
+
+from pyspanet.data import SpaData
+from pyspanet.enums import HighLowState, OffOnAutoState, OffOnState, PumpType
+from pyspanet.profile import PumpProfile, pump_profile
+from testing.spa_server import load_frame, patch_frame
+
+
+def test_pump_profile() -> None:
+    """ test deriving pump capabilities from RG descriptors """
+    assert pump_profile(b'1-1-014') == PumpProfile(
+        OffOnState.ON, PumpType.ONE_SPEED, OffOnAutoState
+    )
+    assert pump_profile(b'1-2-23') == PumpProfile(
+        OffOnState.ON, PumpType.TWO_SPEED, HighLowState
+    )
+    assert pump_profile(b'1-X-9') == PumpProfile(
+        OffOnState.ON, PumpType.UNKNOWN, None
+    )
+    assert pump_profile(b'0-') == PumpProfile(OffOnState.OFF, None, None)
+    assert pump_profile(b'1-1-014') is pump_profile(b'1-1-014')
+
+
+def test_spa_profile() -> None:
+    """ test the profile is derived once per device """
+    frame = load_frame()
+    data = SpaData(frame, lazy=True)
+    profile = data.profile
+
+    assert profile.model == 'SV3'
+    assert profile.software == 'SW V5 17 05 31'
+    assert profile.installed == ('pump1', 'pump2', 'pump3')
+    assert profile.pumps['pump1'].states is OffOnAutoState
+    assert SpaData(frame).profile is profile
+
+    with pytest.raises(TypeError):
+        profile.pumps['pump1'] = pump_profile(b'0')  # type: ignore
+
+    data.apply(patch_frame(frame, 'R5', 14, '290'))
+    assert data.profile is profile
+
+    data.apply(patch_frame(frame, 'RG', 7, '1-2-23'))
+    assert data.profile.pumps['pump2'].states is HighLowState
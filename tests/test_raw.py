@@ -0,0 +1,52 @@
+"""Tests module."""
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from pyspanet.data import SpaData
+from pyspanet.raw import INVALID, RAW_FIELDS, register
+from testing.spa_server import load_frame, patch_frame
+
+
+def test_raw() -> None:
+    """ test reading record values as integer arrays """
+    data = SpaData(load_frame(), lazy=True)
+    raw = data.raw
+
+    assert list(raw)[1:4] == ['R2', 'R3', 'R4']
+    assert isinstance(raw['R5'], array)
+    assert raw['R5'][14] == 286
+    assert raw['R3'][5] == INVALID  # software version
+    assert raw['R2'][19] == 316290
+    assert raw.value('power.voltage') == data.power.voltage
+    assert raw.value('temperature.water') == data.water_temperature
+    assert not data._sections.keys() - {'power', 'temperature'}
+
+    with pytest.raises(KeyError):
+        raw.value('pumps.pump1')
+
+
+def test_raw_register() -> None:
+    """ test naming values the schema does not decode """
+    data = SpaData(load_frame())
+    assert data.raw.value('settings.filtration.total_runtime') == 107
+    assert data.raw.value('power.voltage') == 249
+
+    register('telemetry.r9_1', 'R9', 1)
+
+    try:
+        assert data.raw.value('telemetry.r9_1') == 255
+    finally:
+        del RAW_FIELDS['telemetry.r9_1']
+
+
+def test_raw_apply() -> None:
+    """ test the raw view follows applied frames """
+    frame = load_frame()
+    data = SpaData(frame)
+    assert data.raw['R5'][14] == 286
+
+    data.apply(patch_frame(frame, 'R5', 14, '290'))
+    assert data.raw['R5'][14] == 290
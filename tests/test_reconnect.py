@@ -0,0 +1,124 @@
+"""Tests module."""
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from pyspanet.const import CMD_PUMP1
+from pyspanet.enums import BreakerState, OffOnState
+from pyspanet.exceptions import SpaCircuitOpenError
+from pyspanet.net import SpaNetConnection
+from pyspanet.reconnect import SpaReconnectConfig, SpaReconnectPolicy
+from testing.spa_server import SpaServer
+
+
+class Clock():
+    """ monotonic clock under test control """
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name='clock')
+def clock_fixture(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """ frozen time.monotonic """
+    clock = Clock()
+    monkeypatch.setattr('pyspanet.reconnect.time.monotonic', clock)
+    return clock
+
+
+def test_backoff(clock: Clock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """ test attempts back off exponentially with full jitter """
+    ceilings: List[float] = []
+    monkeypatch.setattr(
+        'pyspanet.reconnect.random.uniform',
+        lambda low, high: ceilings.append(high) or high
+    )
+    policy = SpaReconnectPolicy(SpaReconnectConfig(
+        base_delay=1, max_delay=5, failure_threshold=10
+    ))
+
+    for _ in range(5):
+        assert policy.allow()
+        policy.failure()
+        assert not policy.allow()
+        clock.now += policy.retry_after
+
+    assert ceilings == [1, 2, 4, 5, 5]
+
+    policy.success()
+    assert policy.allow()
+    assert policy.failures == 0
+
+
+def test_breaker(clock: Clock) -> None:
+    """ test the breaker opens, lets a trial through and closes """
+    policy = SpaReconnectPolicy(SpaReconnectConfig(
+        base_delay=0, failure_threshold=3, reset_timeout=30
+    ))
+
+    for _ in range(3):
+        assert policy.state == BreakerState.CLOSED
+        policy.failure()
+
+    assert policy.state == BreakerState.OPEN
+    assert not policy.allow()
+    assert policy.retry_after == 30
+
+    # a late failure while open does not extend the wait
+    clock.now += 10
+    policy.failure()
+    assert policy.retry_after == 20
+
+    clock.now += 20
+    assert policy.state == BreakerState.HALF_OPEN
+
+    # reading the state did not start the trial, so this is another
+    # late failure rather than a failed trial
+    policy.failure()
+    assert policy.state == BreakerState.HALF_OPEN
+    assert policy.allow()
+    assert not policy.allow()  # one trial at a time
+
+    policy.failure()
+    assert policy.state == BreakerState.OPEN
+
+    clock.now += 30
+    assert policy.allow()
+    policy.success()
+    assert policy.state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_reconnect(server: SpaServer) -> None:
+    """ test a dropped link is reconnected on the next command """
+    connection = SpaNetConnection(server.config())
+    await connection.connect()
+    await connection._close()  # the relay dropped the socket
+
+    assert await connection.send(CMD_PUMP1, OffOnState.ON)
+    assert server.connections == 2
+
+    await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_circuit_open(server: SpaServer) -> None:
+    """ test callers fail fast while the relay is unreachable """
+    connection = SpaNetConnection(server.config(reconnect={
+        'base_delay': 0, 'failure_threshold': 2, 'reset_timeout': 60
+    }))
+    await server.stop()
+
+    assert not await connection.connect()
+    assert not await connection.send(CMD_PUMP1, OffOnState.ON)
+    assert connection.breaker_state == BreakerState.OPEN
+
+    with pytest.raises(SpaCircuitOpenError) as error:
+        await connection.send(CMD_PUMP1, OffOnState.ON)
+
+    assert error.value.retry_after > 0
+    await connection.disconnect()
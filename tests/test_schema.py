@@ -0,0 +1,129 @@
+"""Tests module."""
+from __future__ import annotations
+
+import pytest
+
+from pyspanet.collections import FloatCodedInteger, PumpDict, PumpsDict
+from pyspanet.data import SpaData
+from pyspanet.diff import SpaChange
+from pyspanet.enums import LightColour, LightMode, OffOnState, OperationMode
+from pyspanet.exceptions import SpaDecodeError, SpaMessageError
+from pyspanet.schema import (
+    CONTAINERS,
+    R5,
+    SCHEMA,
+    SCHEMAS,
+    SpaSchemaRegistry,
+    decode_enum,
+    decode_member,
+    field,
+    split_records,
+)
+from testing.spa_server import load_frame, patch_frame
+
+
+def test_split_records() -> None:
+    """ test splitting a frame into records """
+    records = split_records(load_frame())
+
+    assert list(records) == [
+        'RF', 'R2', 'R3', 'R4', 'R5', 'R6', 'R7', 'R9', 'RA', 'RB', 'RC',
+        'RE', 'RG'
+    ]
+    assert records['R3'][6] == b'SW V5 17 05 31'
+    assert records['RG'][-1] == b'0'
+
+
+def test_schema_sections() -> None:
+    """ test every container is reachable from a section """
+    assert set(SCHEMA.sections) == {
+        path for path in CONTAINERS if '.' not in path
+    }
+
+
+def test_decode_section() -> None:
+    """ test decoding a single section """
+    pumps = SCHEMA.decode_section('pumps', split_records(load_frame()))
+
+    assert isinstance(pumps, PumpsDict)
+    assert list(pumps) == ['pump1', 'pump2', 'pump3', 'pump4', 'pump5']
+    assert isinstance(pumps.pump2, PumpDict)
+    assert pumps.pump2.installed == OffOnState.ON
+
+
+def test_decode_missing_field() -> None:
+    """ test a truncated record names the field it failed on """
+    records = split_records(load_frame())
+    records['R6'] = records['R6'][:5]
+
+    with pytest.raises(SpaMessageError, match='lights.effect'):
+        SCHEMA.decode_section('lights', records)
+
+
+def test_decode_enum() -> None:
+    """ test enums are decoded from their lookup tables """
+    decode = decode_enum(LightColour)
+
+    assert decode(b'29') is LightColour.COLOUR_29
+    assert decode(b'029') is LightColour.COLOUR_29
+    assert decode_member(OperationMode)(b'NORM') is OperationMode.NORM
+
+    with pytest.raises(SpaDecodeError) as error:
+        decode(b'99')
+
+    assert error.value.enum is LightColour
+    assert error.value.value == b'99'
+
+    with pytest.raises(SpaDecodeError):
+        decode(b'x')
+
+
+def test_decode_unknown_enum(caplog: pytest.LogCaptureFixture) -> None:
+    """ test an unknown enum value does not fail its section """
+    records = split_records(patch_frame(load_frame(), 'R6', 2, '99'))
+    lights = SCHEMA.decode_section('lights', records)
+
+    assert lights.colour is None
+    assert lights.mode == LightMode.COLOUR
+    assert 'lights.colour' in caplog.text
+
+
+def test_registry_select() -> None:
+    """ test layouts are selected by model and software version """
+    frame = load_frame()
+    v5 = SCHEMA.replace(field('temperature.water', R5, 15, FloatCodedInteger))
+    v5_17 = SCHEMA.replace()
+    registry = SpaSchemaRegistry(SCHEMA)
+    registry.register('SV3', 'SW V5', v5)
+    registry.register('SV3', 'SW V5 17', v5_17)
+
+    assert SCHEMAS.select(split_records(frame)) is SCHEMA
+    assert registry.select(split_records(frame)) is v5_17
+    assert registry.select(
+        split_records(patch_frame(frame, 'R3', 5, 'SW V5 18 01 01'))
+    ) is v5
+    assert registry.select(
+        split_records(patch_frame(frame, 'R3', 6, 'SV4'))
+    ) is SCHEMA
+    assert registry.get('SV3', 'SW V4') is SCHEMA
+
+
+def test_registry_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    """ test snapshots decode with the layout of their device """
+    frame = load_frame()
+    sv4 = patch_frame(frame, 'R3', 6, 'SV4')
+    registry = SpaSchemaRegistry(SCHEMA)
+    registry.register('SV4', '', SCHEMA.replace(
+        field('temperature.water', R5, 15, FloatCodedInteger)
+    ))
+    monkeypatch.setattr('pyspanet.data.SCHEMAS', registry)
+
+    assert SpaData(sv4).water_temperature == 0
+    assert SpaData(frame).water_temperature.matches(28.6)
+
+    data = SpaData(frame)
+    changes = data.apply(sv4)
+
+    assert data.schema is registry.get('SV4', '')
+    assert SpaChange('device.model', 'SV3', 'SV4') in changes
+    assert SpaChange('temperature.water', 286, 0) in changes
@@ -0,0 +1,101 @@
+"""Tests module."""
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from pyspanet.diff import SpaChange
+from pyspanet.enums import OverflowPolicy
+from pyspanet.net import SpaNetClient
+from pyspanet.subscription import SpaSubscription
+from testing.spa_server import SpaServer, patch_frame
+
+
+def water(old: int, new: int) -> SpaChange:
+    """ water temperature change """
+    return SpaChange('temperature.water', old, new)
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest() -> None:
+    """ test a full queue drops the oldest change """
+    subscription = SpaSubscription(maxsize=2)
+    subscription.put([water(1, 2), water(2, 3), water(3, 4)])
+    subscription.close()
+
+    assert [change async for change in subscription] == [
+        water(2, 3), water(3, 4)
+    ]
+    assert subscription.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce() -> None:
+    """ test coalescing keeps the latest value per field """
+    subscription = SpaSubscription(
+        ('temperature',),
+        overflow=OverflowPolicy.COALESCE
+    )
+    subscription.put([water(1, 2), SpaChange('lights.state', 0, 1)])
+    subscription.put([water(2, 3), SpaChange('temperature.heater', 5, 6)])
+
+    # merged although the queue is far from full
+    assert len(subscription) == 2
+    assert subscription.dropped == 1
+
+    subscription.close()
+
+    assert [change async for change in subscription] == [
+        water(1, 3), SpaChange('temperature.heater', 5, 6)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_full() -> None:
+    """ test a full coalescing queue drops the field queued longest ago """
+    subscription = SpaSubscription(
+        maxsize=2,
+        overflow=OverflowPolicy.COALESCE
+    )
+    subscription.put([
+        water(1, 2),
+        SpaChange('lights.state', 0, 1),
+        SpaChange('temperature.heater', 5, 6),
+    ])
+    subscription.close()
+
+    assert [change async for change in subscription] == [
+        SpaChange('lights.state', 0, 1),
+        SpaChange('temperature.heater', 5, 6),
+    ]
+    assert subscription.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_watch(server: SpaServer) -> None:
+    """ test watching a field of the client """
+    async with SpaNetClient(server.config()) as spa:
+        received: List[SpaChange] = []
+
+        async def consume() -> None:
+            async with spa.watch('temperature.water') as updates:
+                async for change in updates:
+                    received.append(change)
+
+                    if len(received) == 2:
+                        break
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+
+        server.frame = patch_frame(server.frame, 'R5', 14, '290')
+        server.frame = patch_frame(server.frame, 'R5', 13, '1')
+        await spa.refresh()
+        server.frame = patch_frame(server.frame, 'R5', 14, '295')
+        await spa.refresh()
+        await asyncio.wait_for(task, 1)
+
+        assert received == [water(286, 290), water(290, 295)]
+        assert not spa._listeners
@@ -0,0 +1,48 @@
+"""Tests module."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pyspanet.enums import LightBrightness, LightColour
+from pyspanet.net import SpaNetClient
+from testing.spa_server import SpaServer
+
+
+@pytest.mark.asyncio
+async def test_submit(server: SpaServer) -> None:
+    """ test rapid changes are sent once with the last value """
+    async with SpaNetClient(server.config(write_behind_window=0.05)) as spa:
+        server.received.clear()
+
+        ticks = [
+            spa.submit('temperature.target', value)
+            for value in (36.0, 36.5, 37.0, 37.5)
+        ]
+        colour = spa.submit('lights.colour', LightColour.COLOUR_3)
+
+        assert not server.received
+        assert not spa.data.temperature.target.matches(37.5)
+
+        assert await asyncio.gather(*ticks, colour) == [True] * 5
+        assert server.received == ['W40:375', 'S10:3']
+        assert spa.data.temperature.target.matches(37.5)
+        assert spa.data.lights.colour == LightColour.COLOUR_3
+
+        with pytest.raises(ValueError):
+            spa.submit('lights.brightness', LightColour.COLOUR_3)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_flushes(server: SpaServer) -> None:
+    """ test values held back are sent before disconnecting """
+    spa = SpaNetClient(server.config(write_behind_window=10))
+    await spa.connect()
+
+    brightness = spa.submit('lights.brightness', LightBrightness.LEVEL_5)
+    await spa.disconnect()
+
+    assert brightness.done()
+    assert brightness.result()
+    assert server.received[-1] == 'S08:5'